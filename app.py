@@ -1,21 +1,128 @@
+import logging
+import threading
+import time
+_RUN_STARTED = time.perf_counter()
+
 import streamlit as st
 import pandas as pd
 import asyncio
 
 # Import your modules
-from scrapers import techcrunch, producthunt
-from core import analysis, scoring, ner
+from core import ner, store, history, time_machine, memo, tracing, backtest, entities, search, trends, schema, signals, pipeline
 from ui import components
 from core import ai_analyst
 
+# Log INFO and up (cold starts, spaCy model loads) to stderr; a no-op once the root logger has handlers
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
+
 # --- Helper function to load data ---
-@st.cache_data
+@st.cache_resource
 def load_historical_data():
+    # Prefer the month-partitioned Parquet dataset; fall back to the raw CSV.
+    # One compact, shared copy for every session (nothing mutates it), rather than a copy per session
+    if history.exists():
+        return history.load_history()
     try:
-        return pd.read_csv('historical_data.csv', parse_dates=['date'])
+        return schema.compact(pd.read_csv(history.HISTORY_CSV, parse_dates=['date']))
     except FileNotFoundError:
         return None
 
+@st.cache_resource
+def get_time_machine():
+    # Scores and per-day top-k snapshots are built once, so slider moves are just lookups
+    return time_machine.TimeMachineIndex(load_historical_data())
+
+@st.cache_resource
+def get_company_index():
+    # Maps each company to its rows, so the ROI simulator doesn't scan the history
+    return backtest.CompanyIndex(load_historical_data())
+
+@st.cache_resource
+def get_backtester():
+    return backtest.Backtester(load_historical_data())
+
+@st.cache_resource
+def get_item_store():
+    return store.ItemStore()
+
+@st.cache_resource
+def get_pipeline_runner():
+    # Shared by every session, so only one fetch runs at a time
+    return pipeline.BackgroundRunner()
+
+@st.cache_resource
+def get_company_registry():
+    return entities.CompanyRegistry()
+
+def history_fingerprint():
+    # Sizes and modification times of the history files, so any change to their content shows
+    return history.fingerprint() if history.exists() else history.fingerprint(history.HISTORY_CSV)
+
+@st.cache_resource
+def get_search_index():
+    # Synced on a background thread: indexing a large history must not block whichever request
+    # opens the index first. The history is re-indexed only when its files change, and live
+    # items already in the store are backfilled; new ones are added as they arrive.
+    index = search.SearchIndex()
+    ready = threading.Event()
+    df, item_store = load_historical_data(), get_item_store()
+
+    def sync():
+        try:
+            index.sync(df, 'history', fingerprint=history_fingerprint())
+            items = item_store.load()
+            index.sync(items, 'live', fingerprint=item_store.fingerprint(), append_only=True, keys=items['item_id'])
+        finally:
+            ready.set()
+
+    threading.Thread(target=sync, name="search-sync", daemon=True).start()
+    return index, ready
+
+@st.cache_resource
+def get_trend_cube():
+    # Term x week counts over the history, rebuilt only when the history changes
+    return trends.load_or_build(load_historical_data(), fingerprint=history_fingerprint())
+
+@st.cache_resource
+def get_live_trend_cube():
+    cube, _ = trends.TrendCube.load(trends.LIVE_TRENDS_PATH)
+    return cube if cube is not None else trends.TrendCube()
+
+def get_live_trends(item_store, fingerprint):
+    # The store is append-only, so only items added since the last update are tokenized
+    def update():
+        cube = get_live_trend_cube()
+        if cube.add_new(item_store.load()):
+            cube.save(trends.LIVE_TRENDS_PATH)
+        return cube
+    return get_derived_cache().get_or_compute('live_trends', fingerprint, update)
+
+def render_trends(cube, end=None):
+    terms = st.multiselect("Keywords to chart:", trends.DEFAULT_TERMS, default=trends.DEFAULT_TERMS)
+    components.render_analysis_section(
+        cube.rolling(terms, window=4, end=end), cube.bursts(week=end, min_mentions=3), window=4
+    )
+
+@st.cache_resource
+def get_live_company_signals():
+    company_signals = signals.CompanySignals.load()
+    return company_signals if company_signals is not None else signals.CompanySignals()
+
+def get_live_signals(item_store, fingerprint):
+    # Only items scored since the last update are read from the store and folded in
+    def update():
+        company_signals = get_live_company_signals()
+        offset = company_signals.items
+        if company_signals.add_new(item_store.load(offset=offset), get_company_registry(), offset=offset):
+            company_signals.save()
+        return company_signals
+    return get_derived_cache().get_or_compute('live_signals', fingerprint, update)
+
+@st.cache_resource
+def get_derived_cache():
+    return memo.DerivedCache()
+
 # --- Main App Logic ---
 def main():
     st.set_page_config(page_title="Project Signal", page_icon="📡", layout="wide")
@@ -28,7 +135,7 @@ def main():
 
     # --- Sidebar ---
     st.sidebar.title("App Mode")
-    app_mode = st.sidebar.radio("Choose your mode:", ('Live Tracker', 'Historical Analysis'))
+    app_mode = st.sidebar.radio("Choose your mode:", ('Live Tracker', 'Historical Analysis', 'Search'))
     
     st.sidebar.title("About the Signal Score")
     with st.sidebar.expander("How is the score calculated?"):
@@ -47,38 +154,50 @@ def main():
 
     if app_mode == 'Live Tracker':
         st.header("Live Company Signal Tracker")
-        if 'data' not in st.session_state:
-            st.session_state.data = pd.DataFrame()
-
-        if st.button("Fetch Latest News & Products", type="primary"):
-            with st.spinner('Scanning the web for emerging tech...'):
-                tc_df = techcrunch.scrape()
-                ph_df = producthunt.scrape()
-                combined_df = pd.concat([tc_df, ph_df], ignore_index=True)
-                st.session_state.data = combined_df
-            st.success("Successfully fetched the latest data!")
-
-        if not st.session_state.data.empty:
-            df = st.session_state.data.copy()
-            df['Companies'] = (df['title'] + ' ' + df['description']).apply(ner.extract_company_names)
-            
-            company_df = df.explode('Companies').rename(columns={'Companies': 'company_name'})
-            if not company_df.empty:
-                company_df['Signal Score'] = company_df.apply(scoring.calculate_signal_score, axis=1)
-                company_df['Tier'] = company_df['Signal Score'].apply(scoring.get_signal_tier)
-
-                agg_df = company_df.groupby('company_name').agg(
-                    Signal_Score=('Signal Score', 'max'),
-                    Tier=('Tier', 'first'),
-                    Mentions=('company_name', 'size'),
-                    Sources=('source', lambda x: list(x.unique()))
-                ).sort_values(by='Signal_Score', ascending=False)
-                
+        item_store = get_item_store()
+
+        # Load the NER model in the background so it overlaps with the user's fetch and the scrape
+        ner.warm_up_in_background()
+
+        # The scrape -> NER -> score pipeline runs in the background (or from cron with
+        # `python -m core.pipeline --input live`); this page only reads its results from the store
+        runner = get_pipeline_runner()
+        if st.button("Fetch Latest News & Products", type="primary", disabled=runner.running):
+            search_index, _ = get_search_index()
+            runner.start(pipeline.LIVE, item_store=item_store, registry=get_company_registry(),
+                         search_index=search_index)
+        if runner.running:
+            st.info("Scanning the web for emerging tech in the background; rerun to see new items as they land.")
+            st.button("Refresh")
+        elif runner.last_error is not None:
+            st.error(f"The last fetch failed: {runner.last_error}")
+        elif runner.last_summary is not None:
+            summary = runner.last_summary
+            st.success(f"Last fetch: {summary['items_written']} new of {summary['rows_read']} items.")
+
+        # Per-company signals are updated incrementally as items are scored, and ranked by
+        # their time-decayed score, so recent momentum outranks one old high score
+        fingerprint = item_store.fingerprint()
+        if fingerprint[0]:
+            with tracing.span('live_tracker.company_table'):
+                agg_df = get_live_signals(item_store, fingerprint).top_k(
+                    50, now=pd.Timestamp.now(tz='UTC'), registry=get_company_registry()
+                )
+            if not agg_df.empty:
+                st.caption(f"Top companies by Signal Score decayed with a {signals.HALF_LIFE_DAYS:g}-day half-life")
                 st.dataframe(agg_df, use_container_width=True)
+
+                cache_stats = ner.get_ner_cache().stats()
+                st.caption(f"NER cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                           f"({cache_stats['hit_rate']:.0%} hit rate, {cache_stats['entries']} entries)")
+                derived_stats = get_derived_cache().stats()
+                st.caption(f"Results cache: {derived_stats['hits']} hits, {derived_stats['misses']} misses "
+                           f"({derived_stats['hit_rate']:.0%} hit rate)")
+            render_trends(get_live_trends(item_store, fingerprint))
         else:
             st.info("Click the button to fetch live data.")
 
-    elif app_mode == 'Time Machine':
+    elif app_mode == 'Historical Analysis':
         st.header("Time Machine & ROI Simulator")
 
         # --- The Time Machine Slider ---
@@ -90,13 +209,9 @@ def main():
             format="YYYY-MM-DD"
         )
 
-        # Filter data up to the selected date
-        past_df = historical_df[historical_df['date'] <= pd.to_datetime(selected_date)].copy()
-        past_df['Signal Score'] = past_df.apply(scoring.calculate_signal_score, axis=1)
-        past_df['Tier'] = past_df['Signal Score'].apply(scoring.get_signal_tier)
-        
         st.subheader(f"Top Signals as of {selected_date.strftime('%Y-%m-%d')}")
-        top_signals_df = past_df.sort_values(by='Signal Score', ascending=False).head(10)
+        with tracing.span('time_machine.top_k', rows=10):
+            top_signals_df = get_time_machine().top_k(selected_date, k=10)
 
         st.dataframe(
             top_signals_df[['Tier', 'Signal Score', 'company_name', 'title']],
@@ -104,6 +219,15 @@ def main():
             hide_index=True
         )
         
+        # Opt-in: warm the analysis cache for this date's top signals while the user looks at the
+        # table. Each new date costs up to 10 paid API calls, so it is off unless asked for.
+        prefetch = st.checkbox("Prefetch AI analyses for these signals", value=False,
+                               help="Generates the AI Analyst Take of every signal shown, in the background.")
+        prefetched = st.session_state.setdefault('prefetched_dates', set())
+        if prefetch and selected_date not in prefetched:
+            prefetched.add(selected_date)
+            ai_analyst.prefetch_in_background(zip(top_signals_df['title'], top_signals_df['description']))
+
         selected_company = st.selectbox("Select a company to deep dive:", top_signals_df['company_name'].unique())
 
         if selected_company:
@@ -118,14 +242,16 @@ def main():
                 with st.spinner("Generating AI analysis..."):
                     analyst_take = asyncio.run(ai_analyst.get_analyst_take(
                         company_data['title'], 
-                        company_data['description']
+                        company_data['description'],
+                        # The error will be displayed in the main app UI
+                        on_error=lambda e: st.error(f"An error occurred with the Gemini API: {e}")
                     ))
                     st.markdown(analyst_take)
 
                 # --- The ROI Simulator ---
                 st.subheader("📈 Simulate Investment & Reveal Outcome", divider='rainbow')
                 if st.button(f"Simulate a $1M Investment in {selected_company}"):
-                    true_outcome_row = historical_df[historical_df['company_name'] == selected_company].iloc[0]
+                    true_outcome_row = get_company_index().first(selected_company)
                     
                     outcome = true_outcome_row['outcome']
                     roi = true_outcome_row['roi_potential']
@@ -149,7 +275,60 @@ def main():
                         else:
                             st.metric(label="Simulated Return on Investment", value="N/A")
 
+        # --- Keyword momentum up to the selected date ---
+        render_trends(get_trend_cube(), end=selected_date)
+
+        # --- Strategy Backtest ---
+        with st.expander("📊 Backtest the Signal Score as a strategy"):
+            tier = st.selectbox("Invest in every signal from tier:", list(backtest.TIER_FLOORS))
+            top_k = st.number_input("Keep only the top k signals per week (0 = all):", min_value=0, value=0)
+            once_per_company = st.checkbox("Invest in each company at most once")
+            result = get_backtester().run(backtest.TIER_FLOORS[tier], top_k=int(top_k),
+                                          once_per_company=once_per_company)
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Investments ($1M each)", f"{result['investments']:,}")
+            col2.metric("Portfolio multiple", "N/A" if pd.isna(result['multiple']) else f"{result['multiple']:.2f}x")
+            col3.metric("Exit rate", "N/A" if pd.isna(result['exit_rate']) else f"{result['exit_rate']:.0%}")
+
+    elif app_mode == 'Search':
+        st.header("Search the Corpus")
+        query = st.text_input("Search titles and descriptions:", placeholder='e.g. "computer vision"')
+        col1, col2, col3, col4 = st.columns(4)
+        date_range = col1.date_input(
+            "Published between:",
+            value=(historical_df['date'].min().date(), pd.Timestamp.now().date())
+        )
+        min_score = col2.slider("Minimum Signal Score:", 0, 100, 0)
+        kind = col3.selectbox("Kind:", ('Any', 'funding', 'launch'))
+        corpus = col4.selectbox("Corpus:", ('Both', 'history', 'live'))
+
+        search_index, ready = get_search_index()
+        if not ready.is_set():
+            st.info("The search index is still being built in the background; results may be incomplete.")
+        if query:
+            with st.spinner("Searching..."):
+                start, end = date_range if len(date_range) == 2 else (date_range[0], None)
+                results_df = search_index.search(
+                    query, start=start, end=end, min_score=min_score or None,
+                    kind=None if kind == 'Any' else kind, corpus=None if corpus == 'Both' else corpus,
+                    limit=500
+                )
+            st.caption(f"{len(results_df)} results (showing at most 500, best score first)")
+            st.dataframe(results_df, use_container_width=True, hide_index=True)
+
     components.render_footer()
+    components.render_performance_panel(
+        tracing.TRACER.summary(), tracing.TRACER.to_jsonl(), tracing.TRACER.to_prometheus()
+    )
+
+    # --- Startup-time measurement: the first run of a session is the cold start ---
+    run_seconds = time.perf_counter() - _RUN_STARTED
+    if 'startup_seconds' not in st.session_state:
+        st.session_state.startup_seconds = run_seconds
+        logger.info("Cold start (%s): %.3fs, spaCy model loaded: %s", app_mode, run_seconds, ner.is_model_loaded())
+    st.sidebar.caption(f"Cold start: {st.session_state.startup_seconds:.2f}s · this run: {run_seconds:.2f}s")
 
 if __name__ == "__main__":
-    main()
+    # SIGNAL_PROFILE=<path> dumps a cProfile of the first run
+    with tracing.profile_once_from_env():
+        main()
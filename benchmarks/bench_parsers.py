@@ -0,0 +1,66 @@
+# benchmarks/bench_parsers.py
+"""
+Compares the BeautifulSoup and lxml extraction paths of both scrapers on HTML fixtures.
+
+The fixtures are synthetic, not saved copies of the live sites: generated pages with
+the markup the scrapers select on (120 TechCrunch loop cards, 60 Product Hunt product
+sections) plus page-sized filler such as inline scripts and navigation. They exercise
+both parse paths at a realistic page size, but timings on the real pages, whose
+markup changes over time, will differ.
+
+Run from the repository root:
+    python -m benchmarks.bench_parsers
+"""
+import os
+import time
+import tracemalloc
+
+from scrapers import producthunt, techcrunch
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+FIXTURES = {
+    "techcrunch": (techcrunch, "techcrunch_startups.html"),
+    "producthunt": (producthunt, "producthunt_home.html"),
+}
+
+
+def load_fixture(filename: str) -> bytes:
+    """Reads a (synthetic) page from the fixtures directory."""
+    with open(os.path.join(FIXTURES_DIR, filename), "rb") as f:
+        return f.read()
+
+
+def measure(parse, html: bytes, repeat: int = 20) -> dict:
+    """Best-of-`repeat` wall time and the peak of Python allocations (tracemalloc) during one parse."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        parse(html)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    parse(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"best_ms": min(timings) * 1000, "peak_kib": peak / 1024}
+
+
+def main():
+    for name, (scraper, filename) in FIXTURES.items():
+        html = load_fixture(filename)
+        reference = scraper.parse(html)
+        fast = scraper.parse_fast(html)
+        if not reference.equals(fast):
+            raise AssertionError(f"{name}: parse_fast output differs from parse")
+
+        slow_stats = measure(scraper.parse, html)
+        fast_stats = measure(scraper.parse_fast, html)
+        print(f"{name} ({len(html) / 1024:.0f} KiB, {len(fast)} rows)")
+        print(f"  html.parser + soup: {slow_stats['best_ms']:8.2f} ms  peak {slow_stats['peak_kib']:8.0f} KiB")
+        print(f"  lxml fast path:     {fast_stats['best_ms']:8.2f} ms  peak {fast_stats['peak_kib']:8.0f} KiB")
+        print(f"  speed-up: {slow_stats['best_ms'] / fast_stats['best_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
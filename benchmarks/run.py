@@ -0,0 +1,313 @@
+# benchmarks/run.py
+"""
+Times every pipeline stage at several data sizes and records memory peaks.
+
+Run from the repository root:
+    python -m benchmarks.run                                  # 1k, 100k and 1M rows
+    python -m benchmarks.run --sizes 1000 10000 --output results.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.25
+
+benchmarks/baseline.json holds the stored reference results at the default sizes.
+
+Results are written as JSON. With --baseline, any stage that got slower than the
+baseline by more than the threshold (widened by the stage's own run-to-run spread),
+and still is when timed a second time, is reported and the run exits with status 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import generate_historical_data
+from benchmarks.bench_parsers import FIXTURES, load_fixture
+from core import analysis, backtest, entities, schema, scoring, search, signals, time_machine, trends
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+TREND_KEYWORDS = ['AI', 'LLM', 'fintech', 'climate', 'robotics', 'computer vision', 'platform']
+
+# spaCy NER runs at a few hundred texts per second, so its stage is capped to keep runs practical
+NER_MAX_ROWS = 2_000
+
+# Building the search index costs ~50 µs per row, so the search stages use at most this many rows
+SEARCH_MAX_ROWS = 100_000
+SEARCH_QUERY = 'revolutionize'
+
+# Each stage is timed up to REPEATS times, stopping early once its runs add up to
+# TIME_BUDGET_SECONDS, and its median time is kept
+REPEATS = 7
+TIME_BUDGET_SECONDS = 10.0
+# Stages faster than this (in both runs being compared) are all timer and scheduler noise
+MIN_SECONDS = 0.005
+
+
+def make_history(size: int, seed: int = 7) -> pd.DataFrame:
+    """
+    A synthetic history of `size` rows, built with the data generator's vectorized sampler,
+    in the compact schema the app loads the history in.
+    """
+    generate_historical_data._init_worker(generate_historical_data.build_pools(seed, 2_000, 1_000))
+    df = generate_historical_data.generate_chunk(size, np.random.SeedSequence(seed))
+    df['date'] = pd.to_datetime(df['date'])
+    return schema.compact(df)
+
+
+def _live_items(history: pd.DataFrame) -> pd.DataFrame:
+    """Scored items shaped like the Live Tracker's store, one company per item."""
+    items = history[['source', 'title', 'description']].copy()
+    items['first_seen'] = history['date']
+    items['Companies'] = [[name] for name in history['company_name']]
+    items['Signal Score'], items['Tier'] = scoring.score_frame(items)
+    return items
+
+
+def _time_machine_legacy(history: pd.DataFrame, as_of) -> pd.DataFrame:
+    """The Time Machine's original filter -> score -> sort path."""
+    past_df = history[history['date'] <= as_of].copy()
+    past_df['Signal Score'] = past_df.apply(scoring.calculate_signal_score, axis=1)
+    past_df['Tier'] = past_df['Signal Score'].apply(scoring.get_signal_tier)
+    return past_df.sort_values(by='Signal Score', ascending=False).head(10)
+
+
+def build_stages(history: pd.DataFrame) -> dict:
+    """
+    Maps each stage name to a zero-argument callable over `history`.
+    Stages whose dependencies are missing map to the reason they are skipped.
+    """
+    as_of = history['date'].quantile(0.75)
+    scores, _ = scoring.score_frame(history)
+    items = _live_items(history)
+
+    stages = {
+        'scoring.calculate_signal_score': lambda: history.apply(scoring.calculate_signal_score, axis=1),
+        'scoring.get_signal_tier': lambda: scores.apply(scoring.get_signal_tier),
+        'scoring.score_frame': lambda: scoring.score_frame(history),
+        'analysis.analyze_trends': lambda: analysis.analyze_trends(history, TREND_KEYWORDS),
+        'live_tracker.aggregate_companies': lambda: analysis.aggregate_companies(items),
+        'entities.resolve': lambda: entities.CompanyRegistry(':memory:').resolve(history['company_name']),
+        'time_machine.filter_score_sort': lambda: _time_machine_legacy(history, as_of),
+    }
+
+    company_signals = signals.CompanySignals()
+    company_signals.add_new(items, entities.CompanyRegistry(':memory:'))
+    stages['live_tracker.company_signals'] = lambda: signals.CompanySignals().add_new(
+        items, entities.CompanyRegistry(':memory:')
+    )
+    stages['live_tracker.signals_top_k'] = lambda: company_signals.top_k(50)
+
+    index = time_machine.TimeMachineIndex(history)
+    stages['time_machine.index_top_k'] = lambda: index.top_k(as_of)
+
+    cube = trends.TrendCube().add(history)
+    stages['trends.build_cube'] = lambda: trends.TrendCube().add(history)
+    stages['trends.momentum'] = lambda: (cube.rolling(TREND_KEYWORDS, window=4, end=as_of),
+                                         cube.bursts(week=as_of))
+
+    company = history['company_name'].iloc[-1]
+    companies = backtest.CompanyIndex(history)
+    stages['roi_simulator.scan'] = lambda: history[history['company_name'] == company].iloc[0]
+    stages['roi_simulator.company_index'] = lambda: companies.first(company)
+
+    backtester = backtest.Backtester(history)
+    stages['backtest.sweep'] = lambda: backtester.sweep(
+        list(backtest.TIER_FLOORS.values()), weights=[backtest.DEFAULT_WEIGHTS, (40, 20, 40)],
+        top_k=[0, 10], once_per_company=[False, True]
+    )
+
+    corpus = history.head(SEARCH_MAX_ROWS)
+    search_index = search.SearchIndex(os.path.join(tempfile.mkdtemp(), 'search.sqlite'))
+    search_index.add(corpus, 'history')
+    q1 = (corpus['date'] >= '2024-01-01') & (corpus['date'] <= '2024-03-31')
+    stages['search.scan'] = lambda: corpus[
+        q1 & (corpus['title'] + ' ' + corpus['description']).str.contains(rf'\b{SEARCH_QUERY}\b', case=False)
+    ]
+    stages['search.index_query'] = lambda: search_index.search(SEARCH_QUERY, start='2024-01-01', end='2024-03-31', limit=None)
+
+    try:
+        from core import ner
+        ner.get_nlp()
+        texts = (history['title'] + ' ' + history['description']).head(NER_MAX_ROWS).tolist()
+        # Calls the model directly: going through extract_company_names would time the NER cache instead
+        stages['ner.extract_company_names'] = lambda: [ner._company_names_from_doc(ner.get_nlp()(text)) for text in texts]
+    except (ImportError, OSError) as e:
+        # No spaCy, or no model and no way to download it
+        stages['ner.extract_company_names'] = f"skipped: {e}"
+
+    return stages
+
+
+def build_parser_stages() -> dict:
+    """Scraper parse steps on the synthetic HTML fixtures; these don't depend on the data size."""
+    stages = {}
+    for name, (scraper, filename) in FIXTURES.items():
+        html = load_fixture(filename)
+        stages[f'{name}.parse'] = lambda scraper=scraper, html=html: scraper.parse(html)
+        stages[f'{name}.parse_fast'] = lambda scraper=scraper, html=html: scraper.parse_fast(html)
+    return stages
+
+
+def measure(func) -> dict:
+    """
+    Runs `func` once under tracemalloc for its peak Python allocations (which also warms
+    it up), then times it up to REPEATS times within TIME_BUDGET_SECONDS.
+
+    Records the median time, the number of timed runs and their spread ((max - min) /
+    median), which `compare` uses as the stage's noise floor.
+    """
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+        if sum(timings) >= TIME_BUDGET_SECONDS:
+            break
+
+    median = float(np.median(timings))
+    return {"seconds": median, "runs": len(timings), "spread": (max(timings) - min(timings)) / max(median, 1e-9),
+            "peak_mib": peak / 2**20, "status": "ok"}
+
+
+def run(sizes) -> list[dict]:
+    """Benchmarks every stage at every size and returns one record per (stage, size)."""
+    results = []
+
+    for stage, func in build_parser_stages().items():
+        results.append({"stage": stage, "size": None, **measure(func)})
+        _report(results[-1])
+
+    for size in sizes:
+        history = make_history(size)
+        for stage, func in build_stages(history).items():
+            if isinstance(func, str):
+                record = {"stage": stage, "size": size, "seconds": None, "peak_mib": None, "status": func}
+            else:
+                record = {"stage": stage, "size": size, **measure(func)}
+            if stage == 'ner.extract_company_names' and size > NER_MAX_ROWS:
+                record["rows"] = NER_MAX_ROWS
+            if stage.startswith('search.') and size > SEARCH_MAX_ROWS:
+                record["rows"] = SEARCH_MAX_ROWS
+            results.append(record)
+            _report(record)
+
+    return results
+
+
+def retime(results: list[dict], keys):
+    """
+    Times the (stage, size) `keys` of `results` again, in place, keeping the faster median.
+    A stage can run much slower in one process than in the next on a busy machine, so
+    a slowdown is only reported if it shows up in a second measurement too.
+    """
+    records = {(r["stage"], r["size"]): r for r in results}
+    for size in sorted({size for _, size in keys}, key=lambda size: -1 if size is None else size):
+        stages = build_parser_stages() if size is None else build_stages(make_history(size))
+        for stage, func in stages.items():
+            record = records.get((stage, size))
+            if (stage, size) not in keys or record is None or isinstance(func, str):
+                continue
+            timing = measure(func)
+            if timing["seconds"] < record["seconds"]:
+                record.update(timing)
+            _report(record)
+
+
+def _report(record: dict):
+    size = "fixture" if record["size"] is None else f"{record['size']:,}"
+    if record["status"] != "ok":
+        print(f"{record['stage']:<36} {size:>10}  {record['status']}")
+        return
+    print(f"{record['stage']:<36} {size:>10}  {record['seconds'] * 1000:12.2f} ms  "
+          f"±{record['spread']:4.0%} ({record['runs']} runs)  peak {record['peak_mib']:9.2f} MiB")
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float,
+            min_seconds: float = MIN_SECONDS) -> dict[tuple, str]:
+    """
+    Finds the stages whose median time is slower than the baseline's by more than
+    `threshold` (e.g., 0.25 for 25%) plus the stage's noise floor: the larger of its
+    run-to-run spreads in the two results. Timings under `min_seconds` are treated as noise.
+
+    Returns:
+        A description of each regression, keyed by (stage, size).
+    """
+    previous = {(r["stage"], r["size"]): r for r in baseline if r.get("status") == "ok"}
+    regressions = {}
+    for record in results:
+        before = previous.get((record["stage"], record["size"]))
+        if record["status"] != "ok" or before is None:
+            continue
+        if record["seconds"] < min_seconds and before["seconds"] < min_seconds:
+            continue
+        ratio = record["seconds"] / max(before["seconds"], 1e-9)
+        noise = max(record.get("spread", 0.0), before.get("spread", 0.0))
+        if ratio > 1 + threshold + noise:
+            regressions[(record["stage"], record["size"])] = (
+                f"{record['stage']} @ {record['size']}: {before['seconds'] * 1000:.2f} ms -> "
+                f"{record['seconds'] * 1000:.2f} ms ({ratio:.2f}x, noise floor {noise:.0%})"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark every Project Signal pipeline stage.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Row counts to benchmark.")
+    parser.add_argument('--output', default='bench_results.json', help="Where to write the JSON results.")
+    parser.add_argument('--baseline', help="A previous results file to compare against.")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed slowdown before failing (0.25 = 25%%).")
+    args = parser.parse_args(argv)
+
+    # Read the baseline up front: writing the results first could overwrite it
+    baseline = None
+    if args.baseline:
+        if os.path.abspath(args.baseline) == os.path.abspath(args.output):
+            parser.error("--output must differ from --baseline, or the baseline would be overwritten")
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+    results = run(args.sizes)
+    regressions = {}
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Timing {len(regressions)} slower stage(s) again to rule out noise:")
+            retime(results, set(regressions))
+            regressions = compare(results, baseline, args.threshold)
+
+    payload = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sizes": args.sizes,
+        },
+        "results": results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(payload, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+    if baseline is not None:
+        if regressions:
+            print(f"{len(regressions)} stage(s) regressed by more than {args.threshold:.0%}:")
+            for line in regressions.values():
+                print(f"  {line}")
+            return 1
+        print("No regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
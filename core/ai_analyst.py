@@ -1,17 +1,159 @@
 # core/ai_analyst.py
-import streamlit as st
-import google.generativeai as genai
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future
 
-async def get_analyst_take(title: str, description: str):
+from core import tracing
+from core.cache import SQLiteCache, content_key
+
+# Persistent cache of analyses, so repeat views of a company cost no API call
+ANALYST_CACHE_PATH = os.path.join(".signal_cache", "analyst.sqlite")
+ANALYST_CACHE_TTL = 7 * 24 * 3600  # seconds
+ANALYST_CACHE_MAX_ENTRIES = 5_000
+
+ERROR_MESSAGE = "Error: Could not generate AI analysis."
+
+
+class GeminiBackend:
     """
-    Uses the Gemini API to generate a qualitative analysis of a startup.
+    Generates analyses with the Gemini API. The client is configured once, on first use.
+
+    The SDK's async (grpc.aio) client is bound to the event loop that created it, while
+    callers come from many short-lived loops (every Streamlit rerun's `asyncio.run`, the
+    prefetch thread). So every call runs on one long-lived loop in a dedicated thread,
+    and callers just await its result.
+    """
+
+    def __init__(self, api_key: str | None = None, model_name: str = 'gemini-1.5-flash'):
+        self.api_key = api_key
+        self.model_name = model_name
+        self._model = None
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="gemini-client", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _get_model(self):
+        # Only ever called on the client loop's thread, so the model is created once
+        if self._model is None:
+            # Imported here so app modes that never ask for an analysis don't pay for loading the SDK.
+            import google.generativeai as genai
+
+            genai.configure(api_key=self.api_key or _api_key_from_environment())
+            self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    async def _generate(self, prompt: str) -> str:
+        response = await self._get_model().generate_content_async(prompt)
+        return response.text
+
+    async def generate(self, prompt: str) -> str:
+        future = asyncio.run_coroutine_threadsafe(self._generate(prompt), self._get_loop())
+        return await asyncio.wrap_future(future)
+
+
+def _api_key_from_environment() -> str:
+    """
+    Reads the Gemini API key from the GEMINI_API_KEY environment variable, falling back
+    to Streamlit secrets when running inside the app.
+    """
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if api_key:
+        return api_key
+    import streamlit as st
+    return st.secrets["GEMINI_API_KEY"]
+
+
+class StubBackend:
+    """
+    A local stand-in for Gemini (e.g., for tests): returns canned text and counts calls.
     """
-    # The API key is now fetched and validated in the main app.
-    api_key = st.secrets["GEMINI_API_KEY"]
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-1.5-flash')
 
-    prompt = f"""
+    def __init__(self, response: str = "**The Signal:** Stub analysis.", delay: float = 0.0,
+                 model_name: str = 'stub'):
+        self.response = response
+        self.delay = delay
+        self.model_name = model_name
+        self.calls = 0
+
+    async def generate(self, prompt: str) -> str:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.response
+
+
+class TokenBucket:
+    """
+    A token-bucket rate limiter shared by every event loop and thread in the process.
+    Allows bursts of up to `capacity` calls and `rate` calls per second on average.
+    """
+
+    def __init__(self, rate: float = 1.0, capacity: int = 5):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Takes a token and returns how long the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_backend = None
+_cache = None
+_rate_limiter = TokenBucket()
+
+# Requests currently being answered, keyed like the cache, so identical concurrent
+# requests (from any session's event loop) share one API call
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def set_backend(backend):
+    """Replaces the model backend (any object with `model_name` and an async `generate(prompt)`)."""
+    global _backend
+    _backend = backend
+
+
+def get_backend():
+    """Returns the current backend, defaulting to Gemini."""
+    global _backend
+    if _backend is None:
+        _backend = GeminiBackend()
+    return _backend
+
+
+def get_analyst_cache() -> SQLiteCache:
+    """Returns the shared analysis cache, opening it on first use."""
+    global _cache
+    if _cache is None:
+        _cache = SQLiteCache(ANALYST_CACHE_PATH, max_entries=ANALYST_CACHE_MAX_ENTRIES, ttl=ANALYST_CACHE_TTL)
+    return _cache
+
+
+def build_prompt(title: str, description: str) -> str:
+    """The analyst prompt for one news item."""
+    return f"""
     As a Venture Capital Analyst, provide a brief, insightful analysis of the following startup based on the provided news item.
     Structure your response in markdown with the following sections:
     - **The Signal:** What is the key takeaway from this news?
@@ -22,11 +164,65 @@ async def get_analyst_take(title: str, description: str):
     - Title: "{title}"
     - Description: "{description}"
     """
-    
+
+
+@tracing.traced('ai_analyst.get_analyst_take', rows_in=lambda *args, **kwargs: 1)
+async def get_analyst_take(title: str, description: str, on_error=None):
+    """
+    Uses the Gemini API to generate a qualitative analysis of a startup.
+    If the call fails, `on_error` (when given) is called with the exception and an
+    error message is returned instead.
+
+    Answers are cached by prompt and model, identical requests in flight at the same
+    time share a single API call, and calls to the backend are rate limited.
+    """
+    backend = get_backend()
+    prompt = build_prompt(title, description)
+    key = content_key(backend.model_name, prompt)
+
+    cache = get_analyst_cache()
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            _in_flight[key] = future
+
+    if not is_leader:
+        return await asyncio.wrap_future(future)
+
+    analysis = ERROR_MESSAGE
     try:
-        response = await model.generate_content_async(prompt)
-        return response.text
+        await _rate_limiter.acquire()
+        analysis = await backend.generate(prompt)
+        cache.set(key, analysis)
     except Exception as e:
-        # The error will be displayed in the main app UI
-        st.error(f"An error occurred with the Gemini API: {e}")
-        return "Error: Could not generate AI analysis." 
\ No newline at end of file
+        if on_error is not None:
+            on_error(e)
+    finally:
+        with _in_flight_lock:
+            _in_flight.pop(key, None)
+        future.set_result(analysis)
+    return analysis
+
+
+async def prefetch(items):
+    """
+    Warms the cache with analyses for several (title, description) pairs concurrently.
+    """
+    return await asyncio.gather(
+        *(get_analyst_take(title, description) for title, description in items)
+    )
+
+
+def prefetch_in_background(items) -> threading.Thread:
+    """
+    Runs `prefetch` on a daemon thread so the UI doesn't wait for it.
+    """
+    thread = threading.Thread(target=asyncio.run, args=(prefetch(list(items)),), name="analyst-prefetch", daemon=True)
+    thread.start()
+    return thread
@@ -1,18 +1,45 @@
 import pandas as pd
 
-def analyze_trends(df: pd.DataFrame, keywords: list) -> pd.DataFrame:
+from core import entities, trends, tracing
+
+@tracing.traced('analysis.analyze_trends', rows_in=lambda df, keywords, cube=None: len(df))
+def analyze_trends(df: pd.DataFrame, keywords: list, cube: trends.TrendCube | None = None) -> pd.DataFrame:
     """
     Analyzes the frequency of keywords in the titles and descriptions of articles.
+    Keywords match whole words only ("ai" doesn't match "email"). With a `cube` already
+    built over `df`, the counts are read from it without scanning the text.
     Returns a DataFrame with keywords and their mention counts.
     """
+    if cube is not None:
+        return cube.totals(keywords)
     if df.empty or 'description' not in df.columns or 'title' not in df.columns:
         return pd.DataFrame(columns=['keyword', 'count'])
 
-    keyword_counts = {keyword: 0 for keyword in keywords}
-    text_corpus = (df['title'].fillna('') + ' ' + df['description'].fillna('')).str.lower()
+    text_corpus = df['title'].fillna('') + ' ' + df['description'].fillna('')
+    return pd.DataFrame({'Keyword': list(keywords), 'Mentions': trends.count_mentions(text_corpus, keywords)})
+
+@tracing.traced('live_tracker.aggregate_companies', rows_in=lambda df, registry=None: len(df))
+def aggregate_companies(df: pd.DataFrame, registry: entities.CompanyRegistry | None = None) -> pd.DataFrame:
+    """
+    Builds the Live Tracker's per-company table from scored items with a 'Companies' list column.
 
-    for keyword in keywords:
-        keyword_counts[keyword] = text_corpus.str.contains(keyword.lower()).sum()
+    Names are resolved to company IDs through `registry` (a throwaway in-memory one if None),
+    so "OpenAI", "OpenAI Inc." and "OpenAI's" count as one company.
+    Returns one row per company with its ID, best score, tier, mention count and sources.
+    """
+    company_df = df.explode('Companies').rename(columns={'Companies': 'company_name'})
+    company_df = company_df.dropna(subset=['company_name'])
+    registry = registry if registry is not None else entities.CompanyRegistry(':memory:')
+    company_df['company_id'] = registry.resolve(company_df['company_name'])
+    company_df = company_df[company_df['company_id'] >= 0]
+    if company_df.empty:
+        return pd.DataFrame(columns=['company_id', 'Signal_Score', 'Tier', 'Mentions', 'Sources'],
+                            index=pd.Index([], name='company_name'))
 
-    trends_df = pd.DataFrame(list(keyword_counts.items()), columns=['Keyword', 'Mentions'])
-    return trends_df
\ No newline at end of file
+    companies = company_df.groupby('company_id').agg(
+        Signal_Score=('Signal Score', 'max'),
+        Tier=('Tier', 'first'),
+        Mentions=('company_name', 'size')
+    )
+    companies['Sources'] = entities.sources_by_company(company_df['company_id'], company_df['source'])
+    return registry.index_by_name(companies).sort_values(by='Signal_Score', ascending=False)
@@ -0,0 +1,237 @@
+# core/backtest.py
+"""
+Backtests the Signal Score as an investment strategy over the whole history.
+
+    python -m core.backtest --thresholds 50 70 85.1 --top-k 0 3 10 --weights 30,30,40 40,20,40 --workers 4
+
+Every strategy puts the same stake into each signal it picks and is paid out by the
+item's known outcome: an exit returns `roi_potential` times the stake, a shutdown
+loses it, and an unresolved item (outcome 'N/A') is held at `unresolved_multiple`.
+"""
+import argparse
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from core import scoring, tracing
+
+# Weights of the AI confidence, source and content factors in the Signal Score
+DEFAULT_WEIGHTS = (30, 30, 40)
+
+# Lowest score in each tier; scores are rounded to one decimal, so "> 85" is ">= 85.1"
+TIER_FLOORS = {
+    "🔴 Priority Review": 85.1,
+    "🟠 Emerging Trend": 70.0,
+    "🔵 Monitor": 50.0,
+}
+
+
+class Backtester:
+    """
+    Holds the history as flat NumPy arrays (sorted by date) so a strategy is evaluated
+    in one vectorized pass.
+
+    Each factor of the score takes only a few values, so every row is reduced to one of
+    at most 36 factor combinations: re-weighting the score only rescores the combinations,
+    and the top k signals of each week are found by counting rows per (week, score)
+    rather than sorting them.
+    """
+
+    def __init__(self, df: pd.DataFrame, stake: float = 1_000_000, unresolved_multiple: float = 1.0):
+        self.stake = stake
+
+        frame = df.sort_values('date', kind='stable', ignore_index=True)
+        levels = scoring.factor_levels(frame)
+        values, codes = zip(*(np.unique(levels[column].to_numpy(), return_inverse=True)
+                              for column in ('ai', 'source', 'content')))
+        # combo_levels[c] holds the (ai, source, content) scores of combination c
+        self.combo_levels = np.array(list(itertools.product(*values)))
+        self.combo = np.ravel_multi_index(codes, [len(v) for v in values]).astype(np.uint8)
+
+        days = frame['date'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+        # 1970-01-01 was a Thursday; shift so weeks start on Monday
+        self.weeks, self.week = np.unique((days + 3) // 7, return_inverse=True)
+        self.week_start = np.searchsorted(self.week, np.arange(len(self.weeks)))
+        self.company = pd.factorize(frame['company_name'])[0].astype(np.int32)
+
+        roi = frame['roi_potential'].to_numpy(dtype=float)
+        resolved = (frame['outcome'].notna() & (frame['outcome'] != 'N/A')).to_numpy()
+        # What each $1 invested returns: the exit multiple, nothing after a shutdown,
+        # or `unresolved_multiple` while the outcome is still unknown
+        self.multiple = np.where(resolved, np.where(roi > 0, roi, 0.0), unresolved_multiple)
+        self.exited = resolved & (roi > 0)
+        self.failed = resolved & (roi < 0)
+
+    def __len__(self) -> int:
+        return len(self.multiple)
+
+    def combo_scores(self, weights=DEFAULT_WEIGHTS) -> np.ndarray:
+        """The Signal Score of each factor combination under the given (ai, source, content) weights."""
+        w_ai, w_source, w_content = weights
+        ai, source, content = self.combo_levels.T
+        return np.round((ai * w_ai) + (source * w_source) + (content * w_content), 1)
+
+    def scores(self, weights=DEFAULT_WEIGHTS) -> np.ndarray:
+        """The Signal Score of every row under the given weights."""
+        return self.combo_scores(weights)[self.combo]
+
+    def select(self, threshold: float, weights=DEFAULT_WEIGHTS, top_k: int = 0,
+               once_per_company: bool = False) -> np.ndarray:
+        """
+        Returns the row positions (in date order) a strategy invests in.
+
+        Args:
+            threshold: Only signals scoring at least this much qualify.
+            weights: The (ai, source, content) weights of the score.
+            top_k: If positive, only the k best qualifying signals of each week (ties go
+                   to the earlier signal); otherwise every qualifying signal.
+            once_per_company: Invest only in the first picked signal of each company.
+        """
+        combo_scores = self.combo_scores(weights)
+        picked = (combo_scores >= threshold)[self.combo]
+
+        if top_k > 0:
+            # Rank the distinct scores best first and count qualifying rows per (week, rank)
+            distinct, combo_rank = np.unique(-combo_scores, return_inverse=True)
+            rank = combo_rank.astype(np.uint8)[self.combo]
+            counts = np.bincount(self.week * len(distinct) + rank, weights=picked,
+                                 minlength=len(self.weeks) * len(distinct)).reshape(len(self.weeks), -1)
+            covered = np.cumsum(counts, axis=1)
+            # The rank at which each week reaches k signals, and how many of that rank still fit
+            cutoff = (covered < top_k).sum(axis=1)
+            before = np.where(cutoff > 0, covered[np.arange(len(cutoff)), np.maximum(cutoff - 1, 0)], 0)
+            room = top_k - before
+
+            row_cutoff = cutoff[self.week]
+            tied = picked & (rank == row_cutoff)
+            # Position of each tied row among its week's tied rows, in date order
+            seen = np.cumsum(tied)
+            tie_order = seen - (seen[self.week_start] - tied[self.week_start])[self.week]
+            picked &= (rank < row_cutoff) | (tied & (tie_order <= room[self.week]))
+
+        picked = np.flatnonzero(picked)
+        if once_per_company and len(picked):
+            picked = picked[~pd.Series(self.company[picked]).duplicated().to_numpy()]
+        return picked
+
+    @tracing.traced('backtest.run')
+    def run(self, threshold: float, weights=DEFAULT_WEIGHTS, top_k: int = 0, once_per_company: bool = False) -> dict:
+        """Evaluates one strategy and returns its parameters with the resulting performance."""
+        picked = self.select(threshold, weights, top_k, once_per_company)
+        tracing.record_rows(len(self))
+        invested = len(picked) * self.stake
+        returned = float(self.multiple[picked].sum()) * self.stake
+        return {
+            'threshold': threshold,
+            'weights': tuple(weights),
+            'top_k': top_k,
+            'once_per_company': once_per_company,
+            'investments': len(picked),
+            'invested': invested,
+            'returned': returned,
+            'multiple': returned / invested if invested else np.nan,
+            'exit_rate': float(self.exited[picked].mean()) if len(picked) else np.nan,
+            'failure_rate': float(self.failed[picked].mean()) if len(picked) else np.nan,
+        }
+
+    def sweep(self, thresholds, weights=(DEFAULT_WEIGHTS,), top_k=(0,), once_per_company=(False,),
+              workers: int = 1) -> pd.DataFrame:
+        """
+        Runs every combination of the given parameters, across `workers` processes,
+        and returns one row per strategy, best multiple first.
+        """
+        grid = [
+            {'threshold': t, 'weights': tuple(w), 'top_k': k, 'once_per_company': o}
+            for t, w, k, o in itertools.product(thresholds, weights, top_k, once_per_company)
+        ]
+        if workers <= 1 or len(grid) == 1:
+            results = [self.run(**params) for params in grid]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as pool:
+                results = list(pool.map(_run_params, grid, chunksize=max(1, len(grid) // (workers * 4))))
+        return pd.DataFrame(results).sort_values('multiple', ascending=False, ignore_index=True)
+
+
+# Each worker process receives the prepared arrays once, then only strategy parameters
+_backtester = None
+
+
+def _init_worker(backtester: Backtester):
+    global _backtester
+    _backtester = backtester
+
+
+def _run_params(params: dict) -> dict:
+    return _backtester.run(**params)
+
+
+class CompanyIndex:
+    """
+    Looks up a company's rows in the history without scanning it.
+
+    Rows are grouped by company (keeping their original order within a company), and
+    each company maps to the slice of its rows through a hash index.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        codes, companies = pd.factorize(df['company_name'])
+        order = np.argsort(codes, kind='stable')
+        self.frame = df.iloc[order]
+        self.companies = pd.Index(companies)
+        # Rows without a company (code -1) sort first and are never reachable
+        self.offsets = np.searchsorted(codes[order], np.arange(len(companies) + 1))
+
+    def rows(self, company: str) -> pd.DataFrame:
+        """All rows of `company`, in their original order (empty if unknown)."""
+        if company not in self.companies:
+            return self.frame.iloc[0:0]
+        code = self.companies.get_loc(company)
+        return self.frame.iloc[self.offsets[code]:self.offsets[code + 1]]
+
+    def first(self, company: str) -> pd.Series | None:
+        """The first row of `company`, or None if it never appears."""
+        rows = self.rows(company)
+        return rows.iloc[0] if len(rows) else None
+
+
+def _parse_weights(text: str) -> tuple:
+    weights = tuple(float(part) for part in text.split(','))
+    if len(weights) != 3:
+        raise argparse.ArgumentTypeError("weights are three comma-separated numbers: ai,source,content")
+    return weights
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest Signal Score strategies over the history.")
+    parser.add_argument('--input', default=None,
+                        help="A historical CSV or Parquet dataset (defaults to the converted history, else the CSV).")
+    parser.add_argument('--thresholds', type=float, nargs='+', default=list(TIER_FLOORS.values()),
+                        help="Minimum scores to sweep.")
+    parser.add_argument('--weights', type=_parse_weights, nargs='+', default=[DEFAULT_WEIGHTS],
+                        help="ai,source,content weight triples to sweep.")
+    parser.add_argument('--top-k', type=int, nargs='+', default=[0], help="Signals per week to keep (0 = all).")
+    parser.add_argument('--once-per-company', action='store_true', help="Invest in each company at most once.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    parser.add_argument('--output', help="Also write the results to this CSV file.")
+    args = parser.parse_args(argv)
+
+    from core import history
+    if args.input and args.input.endswith('.csv'):
+        df = pd.read_csv(args.input, parse_dates=['date'])
+    elif args.input or history.exists():
+        df = history.load_history(path=args.input or history.HISTORY_DIR)
+    else:
+        df = pd.read_csv(history.HISTORY_CSV, parse_dates=['date'])
+
+    results = Backtester(df).sweep(args.thresholds, args.weights, args.top_k, (args.once_per_company,),
+                                   workers=args.workers)
+    print(results.to_string(index=False))
+    if args.output:
+        results.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
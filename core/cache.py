@@ -0,0 +1,149 @@
+# core/cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from core import tracing
+
+
+def content_key(*parts: str) -> str:
+    """
+    Builds a stable, content-addressed cache key from one or more strings.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def save_npz(path: str, **arrays):
+    """
+    Writes `arrays` to the .npz file `path` atomically: to a temporary file in the same
+    directory first, then renamed over `path`, so concurrent writers or a crash never
+    leave a torn file for the next reader.
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+class SQLiteCache:
+    """
+    A small disk-backed key-value cache with a size bound and LRU eviction.
+
+    Values are stored as JSON. Every read refreshes the entry's last-access time,
+    and once the cache grows past `max_entries` the least recently used entries
+    are evicted. An optional `ttl` (seconds) expires entries on read.
+    """
+
+    def __init__(self, path: str, max_entries: int = 100_000, ttl: float | None = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Streamlit serves reruns from several threads, so share one guarded connection
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at)")
+
+    def get(self, key: str, default=None):
+        """Returns the cached value for `key`, or `default` on a miss."""
+        found = self.get_many([key])
+        return found.get(key, default)
+
+    def get_many(self, keys) -> dict:
+        """Returns a {key: value} dict holding only the keys present in the cache."""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        now = time.time()
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, value, created_at FROM cache WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, value, created_at in rows:
+                    if self.ttl is not None and now - created_at > self.ttl:
+                        continue
+                    found[key] = json.loads(value)
+
+            if found:
+                with self._conn:
+                    self._conn.executemany(
+                        "UPDATE cache SET accessed_at = ? WHERE key = ?", [(now, key) for key in found]
+                    )
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        tracing.record_cache(hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    def set(self, key: str, value):
+        """Stores a JSON-serializable value under `key`."""
+        self.set_many({key: value})
+
+    def set_many(self, items: dict):
+        """Stores several values at once, then evicts down to `max_entries`."""
+        if not items:
+            return
+        now = time.time()
+        rows = [(key, json.dumps(value), now, now) for key, value in items.items()]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)", rows
+            )
+            overflow = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                    (overflow,)
+                )
+
+    def clear(self):
+        """Removes every entry and resets the hit/miss counters."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache")
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters, the hit rate and the current number of entries."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self),
+        }
@@ -0,0 +1,255 @@
+# core/entities.py
+"""
+Company entity resolution: maps the raw organisation names NER finds ("OpenAI",
+"OpenAI Inc.", "OpenAI's") to one stable integer company ID.
+
+Names are first normalized (case, possessives, punctuation and legal suffixes). Names
+that still differ are matched by the Jaccard similarity of their character trigrams,
+but only within MinHash LSH buckets, so resolving n names costs about O(n) rather than
+comparing every pair.
+"""
+import os
+import sqlite3
+import threading
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from core import tracing
+
+COMPANY_REGISTRY_PATH = os.path.join(".signal_data", "companies.sqlite")
+
+LEGAL_SUFFIXES = [
+    'inc', 'incorporated', 'corp', 'corporation', 'co', 'company', 'llc', 'llp', 'ltd', 'limited',
+    'plc', 'gmbh', 'ag', 'sa', 'sas', 'srl', 'bv', 'nv', 'oy', 'ab', 'pte', 'pty', 'holdings',
+]
+_SUFFIX_PATTERN = r'(?:\s+(?:' + '|'.join(LEGAL_SUFFIXES) + r'))+$'
+
+# Names whose trigram sets are at least this similar are the same company
+MATCH_THRESHOLD = 0.8
+
+# 32 MinHash values split into 8 bands of 4: names with a trigram Jaccard similarity of
+# 0.8 share a band with probability ~0.96, names at 0.3 with probability ~0.06
+NUM_PERM = 32
+BANDS = 8
+_ROWS = NUM_PERM // BANDS
+_PRIME = (1 << 61) - 1
+_perm_rng = np.random.default_rng(20240601)
+_PERM_A = _perm_rng.integers(1, _PRIME, NUM_PERM, dtype=np.uint64)
+_PERM_B = _perm_rng.integers(0, _PRIME, NUM_PERM, dtype=np.uint64)
+
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """
+    Canonical form of company names: NFKC unicode, casefolded, without possessives,
+    punctuation, a leading "the" or trailing legal suffixes ("Inc.", "Ltd", ...).
+    """
+    raw = names.astype(str).str.normalize('NFKC').str.casefold()
+    norm = (raw.str.replace(r"[’']s\b", '', regex=True)
+               .str.replace('&', ' and ', regex=False)
+               .str.replace(r'[^\w\s]', ' ', regex=True)
+               .str.replace(r'\s+', ' ', regex=True)
+               .str.strip()
+               .str.replace(r'^the\s+', '', regex=True)
+               .str.replace(_SUFFIX_PATTERN, '', regex=True))
+    # A name made only of a suffix ("Co.") keeps its plain form
+    return norm.where(norm != '', raw.str.strip())
+
+
+def _shingles(name: str) -> set:
+    """Character trigrams of a normalized name, ignoring spaces ("hugging face" ~ "huggingface")."""
+    compact = name.replace(' ', '')
+    if len(compact) < 3:
+        return {compact}
+    return {compact[i:i + 3] for i in range(len(compact) - 2)}
+
+
+def _jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b)
+
+
+def _band_keys(shingle_sets: list) -> np.ndarray:
+    """
+    The LSH bucket keys of each name, shape (len(shingle_sets), BANDS), as int64.
+    MinHash signatures are computed for all names at once with one reduceat.
+    """
+    lengths = np.array([len(s) for s in shingle_sets])
+    hashes = np.array([zlib.crc32(g.encode('utf-8')) for s in shingle_sets for g in s], dtype=np.uint64)
+    # One universal hash per permutation; uint64 arithmetic wraps, which is fine for hashing
+    permuted = (hashes[:, None] * _PERM_A + _PERM_B) % np.uint64(_PRIME)
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    signatures = np.minimum.reduceat(permuted, starts, axis=0)
+
+    bands = signatures.reshape(len(shingle_sets), BANDS, _ROWS)
+    keys = np.zeros((len(shingle_sets), BANDS), dtype=np.uint64)
+    for row in range(_ROWS):
+        keys = keys * np.uint64(1_000_003) + bands[:, :, row]
+    keys = keys * np.uint64(31) + np.arange(BANDS, dtype=np.uint64)
+    return keys.view(np.int64)
+
+
+class CompanyRegistry:
+    """
+    A persistent registry of resolved companies.
+
+    Every normalized name ever seen maps to a company ID that never changes, and each
+    ID keeps the first raw name it was seen under for display. The LSH buckets of the
+    known names are stored alongside, so new names are matched against the registry
+    with indexed lookups instead of a scan. Use path=':memory:' for a throwaway registry.
+    """
+
+    def __init__(self, path: str = COMPANY_REGISTRY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            if path != ':memory:':
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS companies ("
+                "company_id INTEGER PRIMARY KEY AUTOINCREMENT, display_name TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS names (normalized TEXT PRIMARY KEY, company_id INTEGER NOT NULL)"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS buckets (bucket INTEGER NOT NULL, normalized TEXT NOT NULL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_buckets_bucket ON buckets (bucket)")
+
+    def _select_in(self, query: str, values: list) -> list:
+        """Runs `query` (with one IN placeholder group) over `values` in chunks."""
+        rows = []
+        for start in range(0, len(values), 500):
+            chunk = values[start:start + 500]
+            rows.extend(self._conn.execute(query.format(",".join("?" * len(chunk))), chunk).fetchall())
+        return rows
+
+    @tracing.traced('entities.resolve', rows_in=lambda self, names: len(names))
+    def resolve(self, names) -> np.ndarray:
+        """
+        Returns the company ID of each name (-1 for missing or empty names),
+        registering names and companies not seen before.
+        """
+        raw = pd.Series(names, dtype=object)
+        present = raw.notna() & (raw.astype(str).str.strip() != '')
+        ids = np.full(len(raw), -1, dtype=np.int64)
+        if not present.any():
+            return ids
+
+        norm = normalize_names(raw[present])
+        unique = pd.unique(norm)
+        with self._lock:
+            known = dict(self._select_in(
+                "SELECT normalized, company_id FROM names WHERE normalized IN ({})", list(unique)
+            ))
+            unknown = [name for name in unique if name not in known]
+            tracing.record_cache(hits=len(unique) - len(unknown), misses=len(unknown))
+            if unknown:
+                first_raw = raw[present].groupby(norm.to_numpy(), sort=False).first()
+                known.update(self._register(unknown, first_raw))
+
+        ids[present.to_numpy()] = norm.map(known).to_numpy(dtype=np.int64)
+        return ids
+
+    def _register(self, unknown: list, first_raw: pd.Series) -> dict:
+        """Matches never-seen normalized names to known or new companies and stores them."""
+        shingles = [_shingles(name) for name in unknown]
+        keys = _band_keys(shingles)
+        buckets = pd.DataFrame({
+            'bucket': keys.ravel(),
+            'position': np.repeat(np.arange(len(unknown)), BANDS),
+        })
+
+        # Candidate matches among the registered names: those sharing any bucket
+        existing = pd.DataFrame(
+            self._select_in("SELECT bucket, normalized FROM buckets WHERE bucket IN ({})",
+                            [int(key) for key in pd.unique(buckets['bucket'])]),
+            columns=['bucket', 'normalized']
+        )
+        existing_ids = dict(self._select_in(
+            "SELECT normalized, company_id FROM names WHERE normalized IN ({})",
+            list(pd.unique(existing['normalized']))
+        ))
+
+        best = {}  # position -> (similarity, company_id) of its best registered match
+        for position, name in buckets.merge(existing, on='bucket')[['position', 'normalized']].drop_duplicates().itertuples(index=False):
+            similarity = _jaccard(shingles[position], _shingles(name))
+            if similarity >= MATCH_THRESHOLD and similarity > best.get(position, (0.0, None))[0]:
+                best[position] = (similarity, existing_ids[name])
+
+        # Candidate matches among the new names themselves, merged with union-find
+        parent = list(range(len(unknown)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        shared = buckets[buckets['bucket'].duplicated(keep=False)]
+        for members in shared.groupby('bucket')['position'].agg(list):
+            for j, b in enumerate(members):
+                for a in members[:j]:
+                    if find(a) != find(b) and _jaccard(shingles[a], shingles[b]) >= MATCH_THRESHOLD:
+                        parent[find(b)] = find(a)
+
+        clusters = {}
+        for position in range(len(unknown)):
+            clusters.setdefault(find(position), []).append(position)
+
+        resolved = {}
+        with self._conn:
+            for members in clusters.values():
+                matches = [best[p] for p in members if p in best]
+                if matches:
+                    company_id = max(matches)[1]
+                else:
+                    company_id = self._conn.execute(
+                        "INSERT INTO companies (display_name) VALUES (?)", (str(first_raw[unknown[members[0]]]),)
+                    ).lastrowid
+                for position in members:
+                    resolved[unknown[position]] = company_id
+
+            self._conn.executemany("INSERT INTO names (normalized, company_id) VALUES (?, ?)", resolved.items())
+            self._conn.executemany(
+                "INSERT INTO buckets (bucket, normalized) VALUES (?, ?)",
+                [(int(key), unknown[position]) for key, position in buckets.itertuples(index=False)]
+            )
+        return resolved
+
+    def display_names(self, company_ids) -> pd.Series:
+        """The display name of each company ID, indexed by ID."""
+        ids = [int(company_id) for company_id in pd.unique(np.asarray(company_ids))]
+        with self._lock:
+            rows = self._select_in("SELECT company_id, display_name FROM companies WHERE company_id IN ({})", ids)
+        return pd.Series(dict(rows), dtype=object).reindex(ids)
+
+    def index_by_name(self, companies: pd.DataFrame) -> pd.DataFrame:
+        """Re-indexes a table indexed by company ID by display name, keeping the ID as a column."""
+        companies = companies.reset_index()
+        companies.index = pd.Index(self.display_names(companies['company_id']).to_numpy(), name='company_name')
+        return companies
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+
+
+def sources_by_company(company_ids: pd.Series, sources: pd.Series) -> pd.Series:
+    """
+    The distinct sources of each company, as lists indexed by company ID.
+
+    Each source is one bit of a per-company mask, summed over the distinct
+    (company, source) pairs with a built-in reduction; the few distinct masks are
+    then decoded to lists once each, instead of once per company.
+    """
+    codes, names = pd.factorize(sources)
+    pairs = pd.DataFrame({'company_id': company_ids.to_numpy(), 'bit': np.left_shift(1, codes)})
+    masks = pairs[codes >= 0].drop_duplicates().groupby('company_id')['bit'].sum()
+    decoded = {mask: [name for i, name in enumerate(names) if mask >> i & 1] for mask in pd.unique(masks)}
+    return masks.map(decoded).rename('Sources')
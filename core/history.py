@@ -0,0 +1,124 @@
+# core/history.py
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+
+from core import schema, scoring
+
+HISTORY_CSV = 'historical_data.csv'
+# Parquet dataset partitioned by month, laid out as historical_data/month=YYYY-MM/part-*.parquet
+HISTORY_DIR = 'historical_data'
+
+_PARTITIONING = ds.partitioning(pa.schema([('month', pa.string())]), flavor='hive')
+
+
+def _month_key(value) -> str:
+    """The partition key ('YYYY-MM') of a date."""
+    return pd.Timestamp(value).strftime('%Y-%m')
+
+
+def convert_csv(csv_path: str = HISTORY_CSV, out_dir: str = HISTORY_DIR, chunksize: int = 500_000) -> int:
+    """
+    Converts the historical CSV into a month-partitioned Parquet dataset.
+    The CSV is read in chunks, so memory stays bounded for large files. Signal Scores
+    and tiers don't depend on anything but the row, so they are computed here once and
+    stored alongside the history, in the compact schema (labels dictionary-encoded).
+
+    Returns:
+        The number of rows written.
+    """
+    if os.path.exists(out_dir):
+        shutil.rmtree(out_dir)
+
+    rows = 0
+    for i, chunk in enumerate(pd.read_csv(csv_path, parse_dates=['date'], chunksize=chunksize)):
+        chunk = chunk.sort_values('date', kind='stable')
+        chunk['Signal Score'], chunk['Tier'] = scoring.score_frame(chunk)
+        chunk = schema.compact(chunk)
+        chunk['month'] = chunk['date'].dt.strftime('%Y-%m')
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        ds.write_dataset(
+            table,
+            out_dir,
+            format='parquet',
+            partitioning=_PARTITIONING,
+            basename_template=f'part-{i:05d}-{{i}}.parquet',
+            existing_data_behavior='overwrite_or_ignore'
+        )
+        rows += len(chunk)
+
+    print(f"Converted {csv_path} into {out_dir}/ with {rows} records.")
+    return rows
+
+
+def exists(path: str = HISTORY_DIR) -> bool:
+    """Whether a converted history dataset is present."""
+    return os.path.isdir(path)
+
+
+def fingerprint(path: str = HISTORY_DIR) -> tuple:
+    """
+    A version stamp of the history's content: the relative path, size and modification
+    time of each of its files (the Parquet dataset's parts, or a single CSV file).
+    """
+    if os.path.isdir(path):
+        files = sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+    else:
+        files = [path]
+    stamps = []
+    for file in files:
+        stat = os.stat(file)
+        stamps.append((os.path.relpath(file, path) if file != path else os.path.basename(file),
+                       stat.st_size, stat.st_mtime_ns))
+    return tuple(stamps)
+
+
+def load_history(columns: list[str] | None = None, start=None, end=None, path: str = HISTORY_DIR) -> pd.DataFrame:
+    """
+    Loads historical records from the Parquet dataset.
+
+    Only the requested columns are read, and the date range is pushed down to the
+    scan: whole month partitions outside it are skipped and row groups are pruned
+    by their date statistics. Files are memory-mapped rather than copied in.
+
+    Args:
+        columns: Columns to load (all of them if None).
+        start: Earliest date to include (inclusive), or None for no lower bound.
+        end: Latest date to include (inclusive), or None for no upper bound.
+        path: Location of the dataset.
+
+    Returns:
+        A DataFrame sorted by date, in the compact schema (see core.schema).
+    """
+    dataset = ds.dataset(
+        path,
+        format='parquet',
+        partitioning=_PARTITIONING,
+        filesystem=pafs.LocalFileSystem(use_mmap=True)
+    )
+
+    predicate = None
+    if start is not None:
+        start = pd.Timestamp(start)
+        predicate = (ds.field('month') >= _month_key(start)) & (ds.field('date') >= pa.scalar(start.to_pydatetime()))
+    if end is not None:
+        end = pd.Timestamp(end)
+        upper = (ds.field('month') <= _month_key(end)) & (ds.field('date') <= pa.scalar(end.to_pydatetime()))
+        predicate = upper if predicate is None else predicate & upper
+
+    if columns is None:
+        columns = [name for name in dataset.schema.names if name != 'month']
+    table = dataset.to_table(columns=list(columns), filter=predicate)
+
+    df = table.to_pandas()
+    if 'date' in df.columns and not df['date'].is_monotonic_increasing:
+        df = df.sort_values('date', kind='stable', ignore_index=True)
+    return schema.compact(df)
+
+
+if __name__ == "__main__":
+    convert_csv()
@@ -0,0 +1,52 @@
+# core/memo.py
+import threading
+from collections import OrderedDict
+
+from core import tracing
+
+
+class DerivedCache:
+    """
+    Memoizes derived results (e.g., the Live Tracker's company table) by the fingerprint
+    of the data they were computed from, so reruns over unchanged data skip the work.
+    Holds at most `max_entries` results, evicting the least recently used.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, name: str, fingerprint, compute):
+        """
+        Returns the cached result for (`name`, `fingerprint`), calling `compute()` on a miss.
+        """
+        key = (name, fingerprint)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                tracing.record_cache(hits=1)
+                return self._entries[key]
+            self.misses += 1
+        tracing.record_cache(misses=1)
+
+        result = compute()
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def stats(self) -> dict:
+        """Returns hit/miss counters, the hit rate and the number of cached results."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
@@ -1,17 +1,104 @@
 # core/ner.py
-import spacy
+import logging
+import os
+import threading
+import time
+import unicodedata
+from functools import lru_cache
+from importlib import metadata
 
-# Load the pre-trained English model. This is best done once when the module is loaded.
-try:
-    NLP = spacy.load("en_core_web_sm")
-except OSError:
-    print("Downloading spaCy model 'en_core_web_sm'...\n"
-          "This is a one-time download.")
-    from spacy.cli import download
-    download("en_core_web_sm")
-    NLP = spacy.load("en_core_web_sm")
+from core import tracing
+from core.cache import SQLiteCache, content_key
 
+MODEL_NAME = "en_core_web_sm"
 
+logger = logging.getLogger(__name__)
+
+# The spaCy model is loaded lazily on first use and then kept for the life of the process,
+# so app modes that never run NER don't pay for importing spaCy or loading the model.
+_nlp = None
+_nlp_lock = threading.Lock()
+model_load_seconds = None
+
+
+def get_nlp():
+    """
+    Returns the shared spaCy pipeline, loading (and if needed downloading) it on first call.
+    """
+    global _nlp, model_load_seconds
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                started = time.perf_counter()
+                import spacy
+                try:
+                    nlp = spacy.load(MODEL_NAME)
+                except OSError:
+                    logger.warning("Downloading spaCy model '%s' (a one-time download)...", MODEL_NAME)
+                    from spacy.cli import download
+                    download(MODEL_NAME)
+                    nlp = spacy.load(MODEL_NAME)
+                model_load_seconds = time.perf_counter() - started
+                logger.info("Loaded spaCy model '%s' in %.2fs", MODEL_NAME, model_load_seconds)
+                _nlp = nlp
+    return _nlp
+
+
+def is_model_loaded() -> bool:
+    """Whether the spaCy model is already in memory."""
+    return _nlp is not None
+
+
+def warm_up_in_background() -> threading.Thread | None:
+    """
+    Starts loading the spaCy model on a daemon thread so the first NER call doesn't wait for it.
+    Returns the thread, or None if the model is already loaded.
+    """
+    if is_model_loaded():
+        return None
+    thread = threading.Thread(target=get_nlp, name="spacy-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+# Persistent cache of NER results, so headlines seen on earlier scrapes skip the model
+NER_CACHE_PATH = os.path.join(".signal_cache", "ner.sqlite")
+NER_CACHE_MAX_ENTRIES = 200_000
+_cache = None
+
+
+def get_ner_cache() -> SQLiteCache:
+    """
+    Returns the shared NER result cache, opening it on first use.
+    Its `stats()` report the hit/miss counters.
+    """
+    global _cache
+    if _cache is None:
+        _cache = SQLiteCache(NER_CACHE_PATH, max_entries=NER_CACHE_MAX_ENTRIES)
+    return _cache
+
+
+def _normalize(text: str) -> str:
+    """Canonical form of a text: NFC unicode with whitespace runs collapsed."""
+    return unicodedata.normalize("NFC", " ".join(text.split()))
+
+
+@lru_cache(maxsize=1)
+def _model_version() -> str:
+    """
+    The installed model's version, read from package metadata so cache lookups don't need the model loaded.
+    """
+    try:
+        return metadata.version(MODEL_NAME)
+    except metadata.PackageNotFoundError:
+        return get_nlp().meta.get("version", "")
+
+
+def _cache_key(normalized_text: str) -> str:
+    """Keys a result by the text and the exact model that produced it."""
+    return content_key(MODEL_NAME, _model_version(), normalized_text)
+
+
+@tracing.traced('ner.extract_company_names', rows_in=lambda *args, **kwargs: 1)
 def extract_company_names(text: str) -> list[str]:
     """
     Extracts company names (entities labeled as 'ORG') from a given text.
@@ -26,8 +113,23 @@ def extract_company_names(text: str) -> list[str]:
     if not isinstance(text, str) or not text:
         return []
 
-    doc = NLP(text)
+    text = _normalize(text)
+    if not text:
+        return []
+
+    cache = get_ner_cache()
+    key = _cache_key(text)
+    company_names = cache.get(key)
+    if company_names is None:
+        company_names = _company_names_from_doc(get_nlp()(text))
+        cache.set(key, company_names)
+    return company_names
+
 
+def _company_names_from_doc(doc) -> list[str]:
+    """
+    Collects the unique, reasonably short ORG entities from a processed doc.
+    """
     company_names = []
     # Iterate over the identified entities
     for entity in doc.ents:
@@ -38,4 +140,66 @@ def extract_company_names(text: str) -> list[str]:
                 company_names.append(entity.text.strip())
 
     # Return a list of unique company names to avoid duplicates
-    return list(set(company_names)) 
\ No newline at end of file
+    return list(set(company_names))
+
+
+def _unused_components() -> list[str]:
+    """
+    Returns the pipeline components that ORG extraction does not need.
+    The shared tok2vec layer is only dropped when the NER component does not listen to it.
+    """
+    nlp = get_nlp()
+    unused = [name for name in ("tagger", "parser", "attribute_ruler", "lemmatizer") if name in nlp.pipe_names]
+    if "tok2vec" in nlp.pipe_names and "ner" not in getattr(nlp.get_pipe("tok2vec"), "listening_components", []):
+        unused.append("tok2vec")
+    return unused
+
+
+@tracing.traced('ner.extract_company_names_batch')
+def extract_company_names_batch(texts, batch_size: int = 256, n_process: int = 1) -> list[list[str]]:
+    """
+    Extracts company names from many texts at once by streaming them through spaCy's `nlp.pipe`.
+    Cached texts are answered from the NER cache; for the rest only the components
+    needed for NER are run, and the work can be spread over several processes.
+
+    Args:
+        texts: An iterable of strings (e.g., "title description" for each row).
+        batch_size: Number of texts spaCy processes per batch.
+        n_process: Number of worker processes (-1 uses every CPU core).
+
+    Returns:
+        A list with one list of unique company names per input text, in input order.
+    """
+    texts = list(texts)
+    results = [[] for _ in texts]
+    tracing.record_rows(len(texts))
+
+    # Empty or non-string inputs never reach the model
+    normalized = {i: _normalize(text) for i, text in enumerate(texts) if isinstance(text, str) and text}
+    normalized = {i: text for i, text in normalized.items() if text}
+    if not normalized:
+        return results
+
+    # Only texts missing from the cache are sent to the model, each distinct one once
+    keys = {i: _cache_key(text) for i, text in normalized.items()}
+    found = get_ner_cache().get_many(keys.values())
+    unseen = {}
+    for i, key in keys.items():
+        if key not in found:
+            unseen.setdefault(key, normalized[i])
+
+    if unseen:
+        docs = get_nlp().pipe(
+            unseen.values(),
+            batch_size=batch_size,
+            n_process=n_process,
+            disable=_unused_components()
+        )
+        computed = {key: _company_names_from_doc(doc) for key, doc in zip(unseen, docs)}
+        get_ner_cache().set_many(computed)
+        found.update(computed)
+
+    for i, key in keys.items():
+        results[i] = list(found[key])
+
+    return results
@@ -0,0 +1,299 @@
+# core/pipeline.py
+"""
+Headless batch pipeline: scrape (or read history) -> NER -> score -> aggregate, without Streamlit.
+
+Rows flow through as a chunked generator, so memory stays bounded by the batch size
+plus the per-company aggregate. Scored items and the company aggregate are written to
+JSON lines or Parquet.
+
+    python -m core.pipeline --input live --output-dir pipeline_output
+    python -m core.pipeline --input historical_data.csv --batch-size 100000 --format parquet
+    python -m core.pipeline --input live --n-process 4
+
+Live runs write their results to the item store the dashboard reads, so the dashboard
+only shows precomputed results: from cron runs, or from a run it starts in the background.
+"""
+import argparse
+import logging
+import os
+import threading
+
+import pandas as pd
+
+from core import entities, ner, schema, scoring, search, signals, store, tracing
+
+LIVE = 'live'
+
+
+def iter_batches(source: str, batch_size: int = 10_000):
+    """
+    Yields DataFrames of at most `batch_size` rows from a source.
+
+    Args:
+        source: 'live' to scrape every source now, or the path of a historical CSV file,
+                Parquet file or month-partitioned Parquet dataset directory.
+        batch_size: Maximum rows per yielded batch.
+    """
+    if source == LIVE:
+        from scrapers import fetch, producthunt, techcrunch
+        frames = [df for df in fetch.scrape_all([techcrunch.scrape, producthunt.scrape]) if not df.empty]
+        if not frames:
+            return
+        scraped = pd.concat(frames, ignore_index=True)
+        for start in range(0, len(scraped), batch_size):
+            yield scraped.iloc[start:start + batch_size]
+    elif source.endswith('.csv'):
+        for chunk in pd.read_csv(source, parse_dates=['date'], chunksize=batch_size):
+            yield schema.compact(chunk)
+    else:
+        import pyarrow.dataset as ds
+        dataset = ds.dataset(source, format='parquet', partitioning='hive')
+        columns = [name for name in dataset.schema.names if name != 'month']
+        for record_batch in dataset.to_batches(columns=columns, batch_size=batch_size):
+            yield schema.compact(record_batch.to_pandas())
+
+
+def process_batch(df: pd.DataFrame, registry: entities.CompanyRegistry,
+                  n_process: int = 1) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Runs NER, scoring and company resolution on one batch.
+
+    Historical rows already name their company, so NER only runs on rows without a
+    'company_name' column (i.e., live scrapes), on `n_process` worker processes.
+    Scores are reused when present.
+
+    Returns:
+        (items, mentions): the scored items, and one row per (item, company) mention
+        with its resolved 'company_id'.
+    """
+    items = df.copy()
+    if 'Signal Score' not in items.columns or 'Tier' not in items.columns:
+        items['Signal Score'], items['Tier'] = scoring.score_frame(items)
+
+    if 'company_name' in items.columns:
+        mentions = items
+    else:
+        if 'Companies' not in items.columns:
+            items['Companies'] = pd.Series(
+                ner.extract_company_names_batch(items['title'] + ' ' + items['description'], n_process=n_process),
+                index=items.index, dtype=object
+            )
+        mentions = items.explode('Companies').rename(columns={'Companies': 'company_name'})
+    mentions = mentions.dropna(subset=['company_name'])
+    mentions = mentions.assign(company_id=registry.resolve(mentions['company_name']))
+    mentions = mentions[mentions['company_id'] >= 0]
+    return items, mentions[['company_id', 'source', 'Signal Score', 'Tier']]
+
+
+class CompanyAggregator:
+    """
+    Folds mention batches into the per-company table the Live Tracker shows
+    (best score, first tier, mention count and sources) with vectorized reductions
+    on company IDs, so the full set of mentions never has to be held in memory.
+    """
+
+    def __init__(self, registry: entities.CompanyRegistry):
+        self.registry = registry
+        self._companies = pd.DataFrame(columns=['Signal_Score', 'Tier', 'Mentions'],
+                                       index=pd.Index([], name='company_id'))
+        self._sources = pd.DataFrame(columns=['company_id', 'source'])
+
+    def add(self, mentions: pd.DataFrame):
+        """Merges one batch of (company_id, source, Signal Score, Tier) mentions."""
+        if mentions.empty:
+            return
+        batch = mentions.groupby('company_id', sort=False).agg(
+            Signal_Score=('Signal Score', 'max'),
+            Tier=('Tier', 'first'),
+            Mentions=('company_id', 'size')
+        )
+        combined = pd.concat([self._companies, batch]) if not self._companies.empty else batch
+        self._companies = combined.groupby(level=0, sort=False).agg(
+            Signal_Score=('Signal_Score', 'max'),
+            Tier=('Tier', 'first'),
+            Mentions=('Mentions', 'sum')
+        )
+        pairs = mentions[['company_id', 'source']]
+        self._sources = pd.concat([self._sources, pairs], ignore_index=True).drop_duplicates(ignore_index=True)
+
+    def result(self) -> pd.DataFrame:
+        """The aggregate so far, best score first, indexed by company display name."""
+        companies = self._companies.copy()
+        companies['Mentions'] = companies['Mentions'].astype(int)
+        companies['Sources'] = entities.sources_by_company(self._sources['company_id'], self._sources['source'])
+        companies.index.name = 'company_id'
+        return self.registry.index_by_name(companies).sort_values(by='Signal_Score', ascending=False)
+
+
+class _Writer:
+    """
+    Appends DataFrames to a JSON lines or Parquet file. The file is replaced, and exists
+    once the writer is closed even if nothing (or only empty frames) was written.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._parquet = None
+        if path.endswith('.parquet'):
+            if os.path.exists(path):
+                os.remove(path)
+        else:
+            open(path, 'w').close()
+
+    def write(self, df: pd.DataFrame):
+        if df.empty and not self.path.endswith('.parquet'):
+            return
+        if 'Signal Score' in df.columns:
+            # Compact frames hold float32 scores; write them as the one-decimal scores they are
+            df = df.assign(**{'Signal Score': df['Signal Score'].astype(float).round(1)})
+        if self.path.endswith('.parquet'):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table.cast(self._parquet.schema))
+        else:
+            with open(self.path, 'a') as f:
+                df.to_json(f, orient='records', lines=True, date_format='iso', force_ascii=False)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+        elif self.path.endswith('.parquet'):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            pq.write_table(pa.table({}), self.path)
+
+
+@tracing.traced('pipeline.run')
+def run(source: str, output_dir: str = 'pipeline_output', batch_size: int = 10_000, fmt: str = 'jsonl',
+        item_store: store.ItemStore | None = None, registry: entities.CompanyRegistry | None = None,
+        search_index: search.SearchIndex | None = None, n_process: int = 1) -> dict:
+    """
+    Runs the whole pipeline over `source` and writes `items.<fmt>` and `companies.<fmt>`
+    to `output_dir`. Both files are always written, empty if there was nothing to write.
+
+    With an `item_store`, live items are deduplicated against it first and only new
+    ones are processed; their results land in the store the dashboard reads from.
+    `items` then holds this run's new items, while `companies` ranks every company in
+    the store, from the live company signals the dashboard shows (updated with this
+    run's items). Company names are resolved through `registry` (the shared registry
+    for store-backed runs and a throwaway in-memory one otherwise, if None), and
+    processed items are added to `search_index` if given. NER runs on `n_process`
+    worker processes (-1 for one per CPU core).
+
+    Returns:
+        Counts of the rows read, items written and companies aggregated.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    items_writer = _Writer(os.path.join(output_dir, f'items.{fmt}'))
+    from_store = item_store is not None and source == LIVE
+    if registry is None:
+        # Store-backed company signals are keyed by the shared registry's IDs
+        registry = entities.CompanyRegistry() if from_store else entities.CompanyRegistry(':memory:')
+    aggregator = CompanyAggregator(registry)
+    rows_read = items_written = 0
+
+    try:
+        for batch in iter_batches(source, batch_size):
+            rows_read += len(batch)
+            if from_store:
+                batch = store.ingest(item_store, batch, n_process=n_process)
+            items, mentions = process_batch(batch, registry, n_process=n_process)
+            if search_index is not None:
+                search_index.add(items, 'live' if source == LIVE else 'history',
+                                 keys=items['item_id'] if 'item_id' in items.columns else None)
+            items_writer.write(items)
+            aggregator.add(mentions)
+            items_written += len(items)
+            print(f"Processed {rows_read} rows ({items_written} items written)")
+    finally:
+        items_writer.close()
+
+    if from_store:
+        companies = _store_companies(item_store, registry)
+    else:
+        companies = aggregator.result()
+    companies_writer = _Writer(os.path.join(output_dir, f'companies.{fmt}'))
+    companies_writer.write(companies.reset_index())
+    companies_writer.close()
+
+    summary = {'rows_read': rows_read, 'items_written': items_written, 'companies': len(companies)}
+    print(f"Pipeline finished: {summary}")
+    return summary
+
+
+def _store_companies(item_store: store.ItemStore, registry: entities.CompanyRegistry) -> pd.DataFrame:
+    """
+    Every company mentioned in the item store, ranked by decayed score: the persisted
+    live company signals, brought up to date with the store's newly scored items.
+    """
+    company_signals = signals.CompanySignals.load()
+    if company_signals is None:
+        company_signals = signals.CompanySignals()
+    offset = company_signals.items
+    if company_signals.add_new(item_store.load(offset=offset), registry, offset=offset):
+        company_signals.save()
+    return company_signals.top_k(None, registry=registry)
+
+
+class BackgroundRunner:
+    """
+    Runs the pipeline on a daemon thread, one run at a time, so a dashboard request
+    never does the scraping, NER or scoring itself. Keeps the outcome of the last run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self.last_summary = None
+        self.last_error = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, source: str = LIVE, **kwargs) -> bool:
+        """Starts `run(source, **kwargs)` unless a run is in progress; returns whether it started."""
+        with self._lock:
+            if self.running:
+                return False
+            self._thread = threading.Thread(target=self._run, args=(source,), kwargs=kwargs,
+                                            name="pipeline-run", daemon=True)
+            self._thread.start()
+            return True
+
+    def _run(self, source: str, **kwargs):
+        try:
+            self.last_summary, self.last_error = run(source, **kwargs), None
+        except Exception as e:
+            self.last_error = e
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Project Signal pipeline without the dashboard.")
+    parser.add_argument('--input', default=LIVE,
+                        help="'live' to scrape now, or a historical CSV / Parquet file / Parquet dataset directory.")
+    parser.add_argument('--output-dir', default='pipeline_output', help="Where to write items and companies.")
+    parser.add_argument('--batch-size', type=int, default=10_000, help="Rows processed per batch.")
+    parser.add_argument('--format', choices=['jsonl', 'parquet'], default='jsonl', help="Output file format.")
+    parser.add_argument('--no-store', action='store_true',
+                        help="For live input, process every scraped item instead of only ones new to the item store.")
+    parser.add_argument('--n-process', type=int, default=1,
+                        help="Worker processes for NER on live items (-1 = one per CPU core). Each loads its own "
+                             "copy of the spaCy model, so this pays off for large scrapes on multi-core machines.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    # Live runs share the dashboard's item store, company registry and search index
+    live = args.input == LIVE
+    item_store = store.ItemStore() if live and not args.no_store else None
+    registry = entities.CompanyRegistry() if live else None
+    search_index = search.SearchIndex() if live else None
+    run(args.input, output_dir=args.output_dir, batch_size=args.batch_size, fmt=args.format,
+        item_store=item_store, registry=registry, search_index=search_index, n_process=args.n_process)
+
+
+if __name__ == "__main__":
+    main()
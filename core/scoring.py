@@ -1,6 +1,10 @@
 # core/scoring.py
+import re
+import numpy as np
 import pandas as pd
 
+from core import tracing
+
 # Define the keyword matrix with weights
 AI_KEYWORD_MATRIX = {
     'core_ai': (['llm', 'foundational model', 'neural network', 'generative ai', 'computer vision', 'agi', 'transformer architecture'], 1.0),
@@ -8,6 +12,10 @@ AI_KEYWORD_MATRIX = {
     'general_ai': (['ai'], 0.3)
 }
 
+# Source credibility and content-event weights used by the Signal Score
+SOURCE_SCORES = {'TechCrunch': 1.0, 'Product Hunt': 0.6}
+FUNDING_KEYWORDS = ['raises', 'funding', 'series', 'seed round']
+
 def calculate_ai_confidence(text: str) -> float:
     """
     Calculates an AI confidence score based on the presence of tiered keywords.
@@ -43,16 +51,16 @@ def calculate_signal_score(row: pd.Series) -> float:
     # 2. Source Score (Weight: 30%)
     source_score = 0.0
     if row.get('source') == 'TechCrunch':
-        source_score = 1.0 # A+ Signal
+        source_score = SOURCE_SCORES['TechCrunch'] # A+ Signal
     elif row.get('source') == 'Product Hunt':
-        source_score = 0.6 # B Signal
+        source_score = SOURCE_SCORES['Product Hunt'] # B Signal
 
     # 3. Content Score (Weight: 40%)
     content_score = 0.5 # Baseline for general news/other
     title_lower = str(row.get('title', '')).lower()
     
     # Check for highest-value content first
-    if any(keyword in title_lower for keyword in ['raises', 'funding', 'series', 'seed round']):
+    if any(keyword in title_lower for keyword in FUNDING_KEYWORDS):
         content_score = 1.0 # A+ Signal
     elif 'launches' in title_lower:
         content_score = 0.7 # B+ Signal
@@ -75,4 +83,125 @@ def get_signal_tier(score: float) -> str:
     elif score >= 50:
         return "🔵 Monitor"
     else:
-        return "⚪ Low Signal" 
\ No newline at end of file
+        return "⚪ Low Signal"
+
+# --- Vectorized batch scoring ---
+# Each factor of the Signal Score takes only a handful of discrete values, so a
+# whole frame can be scored by classifying every row into (ai, source, content)
+# levels with column operations and looking the final score up in a small table
+# built with the scalar functions above. This keeps the batch path exactly in
+# line with `calculate_signal_score` and `get_signal_tier`.
+_AI_LEVELS = [0.0] + [AI_KEYWORD_MATRIX[tier][1] for tier in ('general_ai', 'applied_ai', 'core_ai')]
+_SOURCE_LEVELS = [0.0, SOURCE_SCORES['Product Hunt'], SOURCE_SCORES['TechCrunch']]
+_CONTENT_LEVELS = [0.5, 0.7, 1.0]
+
+_AI_PATTERNS = {
+    tier: re.compile('|'.join(re.escape(term) for term in terms))
+    for tier, (terms, _) in AI_KEYWORD_MATRIX.items()
+}
+_FUNDING_PATTERN = re.compile('|'.join(re.escape(keyword) for keyword in FUNDING_KEYWORDS))
+
+_SCORE_TABLE = np.array([
+    [[round((ai * 30) + (source * 30) + (content * 40), 1) for content in _CONTENT_LEVELS]
+     for source in _SOURCE_LEVELS]
+    for ai in _AI_LEVELS
+])
+# Tiers from lowest to highest. Batch results are categoricals over these labels, so
+# each row holds a one-byte code instead of its own copy of the label.
+TIERS = ["⚪ Low Signal", "🔵 Monitor", "🟠 Emerging Trend", "🔴 Priority Review"]
+TIER_DTYPE = pd.CategoricalDtype(TIERS, ordered=True)
+_TIER_CODE_TABLE = np.array(
+    [[[TIERS.index(get_signal_tier(score)) for score in by_content] for by_content in by_source]
+     for by_source in _SCORE_TABLE],
+    dtype=np.int8
+)
+
+
+def _text_column(df: pd.DataFrame, column: str) -> pd.Series:
+    """Stringifies a column the same way the row-wise f-string does ('' if missing)."""
+    if column not in df.columns:
+        return pd.Series('', index=df.index, dtype=object)
+    values = df[column]
+    if pd.api.types.is_string_dtype(values) and not values.isna().any():
+        return values
+    return values.astype(object).map(str)
+
+
+def _factor_indices(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Classifies every row into its (ai, source, content) level indices."""
+    title = _text_column(df, 'title')
+    description = _text_column(df, 'description')
+    title_lower = title.str.lower()
+    text_lower = (title + ' ' + description).str.lower()
+
+    # 1. AI Confidence level (0 = none ... 3 = core AI), highest tier wins
+    ai_idx = np.select(
+        [text_lower.str.contains(_AI_PATTERNS[tier], regex=True).to_numpy(dtype=bool)
+         for tier in ('core_ai', 'applied_ai', 'general_ai')],
+        [3, 2, 1],
+        default=0
+    )
+
+    # 2. Source level
+    if 'source' not in df.columns:
+        source_idx = np.zeros(len(df), dtype=int)
+    elif isinstance(df['source'].dtype, pd.CategoricalDtype):
+        # Classify the few categories once and look every row up by its code (-1, missing, maps to 0)
+        source = df['source'].cat
+        by_category = np.select(
+            [source.categories == 'TechCrunch', source.categories == 'Product Hunt'], [2, 1], default=0
+        )
+        source_idx = np.append(by_category, 0)[source.codes.to_numpy()]
+    else:
+        source = df['source']
+        source_idx = np.select(
+            [(source == 'TechCrunch').to_numpy(dtype=bool), (source == 'Product Hunt').to_numpy(dtype=bool)],
+            [2, 1],
+            default=0
+        )
+
+    # 3. Content level (partnerships share the 0.5 baseline)
+    content_idx = np.select(
+        [title_lower.str.contains(_FUNDING_PATTERN, regex=True).to_numpy(dtype=bool),
+         title_lower.str.contains('launches', regex=False).to_numpy(dtype=bool)],
+        [2, 1],
+        default=0
+    )
+    return ai_idx, source_idx, content_idx
+
+
+def factor_levels(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns each row's AI confidence, source and content scores (each between 0 and 1)
+    as columns 'ai', 'source' and 'content', so the Signal Score can be recomputed
+    under other weights without re-reading the text.
+    """
+    ai_idx, source_idx, content_idx = _factor_indices(df)
+    return pd.DataFrame({
+        'ai': np.array(_AI_LEVELS)[ai_idx],
+        'source': np.array(_SOURCE_LEVELS)[source_idx],
+        'content': np.array(_CONTENT_LEVELS)[content_idx],
+    }, index=df.index)
+
+
+@tracing.traced('scoring.score_frame', rows_in=lambda df: len(df))
+def score_frame(df: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
+    """
+    Scores every row of a DataFrame at once.
+
+    Returns:
+        A (scores, tiers) pair of Series aligned with `df.index`, identical to
+        applying `calculate_signal_score` and `get_signal_tier` row by row
+        (tiers as an ordered categorical).
+    """
+    if df.empty:
+        return (pd.Series(index=df.index, dtype=float, name='Signal Score'),
+                pd.Series(index=df.index, dtype=TIER_DTYPE, name='Tier'))
+
+    ai_idx, source_idx, content_idx = _factor_indices(df)
+    scores = pd.Series(_SCORE_TABLE[ai_idx, source_idx, content_idx], index=df.index, name='Signal Score')
+    tiers = pd.Series(
+        pd.Categorical.from_codes(_TIER_CODE_TABLE[ai_idx, source_idx, content_idx], dtype=TIER_DTYPE),
+        index=df.index, name='Tier'
+    )
+    return scores, tiers
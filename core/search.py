@@ -0,0 +1,236 @@
+# core/search.py
+"""
+Full-text search over the historical and live corpora.
+
+Titles and descriptions go into a SQLite FTS5 inverted index (token -> postings), and
+each document's date, score, tier and kind sit in an indexed side table, so a query
+like "funding items mentioning computer vision in Q1" intersects postings and filters
+on those columns without scanning the corpus.
+"""
+import os
+import re
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core import scoring, tracing
+from core.cache import content_key
+
+SEARCH_INDEX_PATH = os.path.join(".signal_data", "search.sqlite")
+
+# What an item announces, from the content factor of its Signal Score
+KINDS = {1.0: 'funding', 0.7: 'launch'}
+
+_QUERY_TERMS = re.compile(r'"([^"]+)"|(\S+)')
+
+
+def to_fts_query(text: str) -> str:
+    """
+    Turns free text into an FTS5 query: every word (or "quoted phrase") must match.
+    Terms are quoted so punctuation and FTS5 operators in user input are taken literally.
+    """
+    terms = []
+    for phrase, word in _QUERY_TERMS.findall(text):
+        term = (phrase or word).replace('"', '').strip()
+        if term:
+            terms.append('"' + term + '"')
+    return ' '.join(terms)
+
+
+class SearchIndex:
+    """
+    A persistent, incrementally updated inverted index of news items.
+
+    Documents are keyed by content hash, so adding a frame that overlaps what is
+    already indexed only indexes the new rows.
+    """
+
+    def __init__(self, path: str = SEARCH_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS docs ("
+                "doc_key TEXT UNIQUE NOT NULL, corpus TEXT NOT NULL, date TEXT NOT NULL, "
+                "source TEXT, company TEXT, title TEXT, signal_score REAL, tier TEXT, kind TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_docs_date ON docs (date)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_docs_score ON docs (signal_score)")
+            # Contentless: the index keeps only the postings, the text itself lives in the corpora
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(title, description, content='')"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS corpora (corpus TEXT PRIMARY KEY, fingerprint TEXT)")
+
+    @tracing.traced('search.add', rows_in=lambda self, df, corpus, keys=None: len(df))
+    def add(self, df: pd.DataFrame, corpus: str, keys=None) -> int:
+        """
+        Indexes the rows of `df` not indexed yet.
+
+        Rows need 'title', 'description' and 'source', should have a 'date' (or 'first_seen'), and may
+        carry 'company_name' (or a 'Companies' list), 'Signal Score' and 'Tier'; missing
+        scores are computed. `keys` identifies each row (e.g., the item store's item_id);
+        by default it is a hash of the row's date, source, title and description.
+
+        Returns:
+            The number of newly indexed rows.
+        """
+        if df.empty:
+            return 0
+        if 'date' in df.columns or 'first_seen' in df.columns:
+            dates = pd.to_datetime(df['date'] if 'date' in df.columns else df['first_seen'], utc=True)
+        else:
+            # Fresh scrapes carry no date: they were published about now
+            dates = pd.Series(pd.Timestamp.now(tz='UTC'), index=df.index)
+        dates = dates.dt.strftime('%Y-%m-%d')
+        if keys is None:
+            keys = [content_key(*row) for row in zip(dates, df['source'], df['title'], df['description'])]
+        keys = pd.Series(list(keys), index=df.index)
+
+        with self._lock:
+            existing = set()
+            unique_keys = list(pd.unique(keys))
+            for start in range(0, len(unique_keys), 500):
+                chunk = unique_keys[start:start + 500]
+                existing.update(row[0] for row in self._conn.execute(
+                    f"SELECT doc_key FROM docs WHERE doc_key IN ({','.join('?' * len(chunk))})", chunk
+                ))
+            new = ~keys.isin(existing) & ~keys.duplicated()
+            if not new.any():
+                return 0
+            rows = df[new.to_numpy()]
+
+            if 'Signal Score' in rows.columns and 'Tier' in rows.columns:
+                scores, tiers = rows['Signal Score'], rows['Tier']
+            else:
+                scores, tiers = scoring.score_frame(rows)
+            kinds = scoring.factor_levels(rows)['content'].map(KINDS)
+            if 'company_name' in rows.columns:
+                companies = rows['company_name']
+            elif 'Companies' in rows.columns:
+                companies = rows['Companies'].map(lambda names: ', '.join(names) if isinstance(names, list) else None)
+            else:
+                companies = pd.Series(None, index=rows.index, dtype=object)
+
+            docs = pd.DataFrame({
+                'doc_key': keys[new], 'corpus': corpus, 'date': dates[new], 'source': rows['source'],
+                'company': companies, 'title': rows['title'], 'signal_score': scores.astype(float).round(1),
+                'tier': tiers, 'kind': kinds,
+            }).astype(object).where(lambda frame: frame.notna(), None)
+
+            with self._conn:
+                first_rowid = (self._conn.execute("SELECT MAX(rowid) FROM docs").fetchone()[0] or 0) + 1
+                rowids = np.arange(first_rowid, first_rowid + len(docs))
+                self._conn.executemany(
+                    "INSERT INTO docs (rowid, doc_key, corpus, date, source, company, title, signal_score, tier, kind) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    zip(rowids.tolist(), *(docs[column].tolist() for column in docs.columns))
+                )
+                self._conn.executemany(
+                    "INSERT INTO docs_fts (rowid, title, description) VALUES (?, ?, ?)",
+                    zip(rowids.tolist(), rows['title'].fillna('').astype(str).tolist(),
+                        rows['description'].fillna('').astype(str).tolist())
+                )
+        return len(docs)
+
+    def clear(self):
+        """
+        Removes every document of every corpus. A contentless FTS5 index can't drop single
+        documents without their text, so a changed corpus is re-indexed from scratch.
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DROP TABLE IF EXISTS docs_fts")
+                self._conn.execute("DROP TABLE IF EXISTS docs")
+                self._conn.execute("DROP TABLE IF EXISTS corpora")
+            self._create_tables()
+
+    def fingerprint(self, corpus: str) -> str | None:
+        """The fingerprint `corpus` was last synced under, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT fingerprint FROM corpora WHERE corpus = ?", (corpus,)).fetchone()
+        return row[0] if row else None
+
+    def sync(self, df: pd.DataFrame, corpus: str, fingerprint, append_only: bool = False, keys=None) -> int:
+        """
+        Brings `corpus` up to date with `df`, skipping all work if it was already synced
+        under the same `fingerprint` (e.g., the sizes and modification times of its files).
+
+        An append-only corpus (e.g., the item store, keyed by `keys`) only gets its
+        missing rows indexed. Any other corpus that changed may have stale documents, so
+        the whole index is cleared and `df` re-indexed: sync every other corpus after it.
+        """
+        fingerprint = repr(fingerprint)
+        indexed = self.fingerprint(corpus)
+        if indexed == fingerprint:
+            return 0
+        if indexed is not None and not append_only:
+            self.clear()
+        added = self.add(df, corpus, keys=keys)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO corpora (corpus, fingerprint) VALUES (?, ?)", (corpus, fingerprint))
+        return added
+
+    @tracing.traced('search.query', rows_out=len)
+    def search(self, text: str, start=None, end=None, min_score: float | None = None, kind: str | None = None,
+               corpus: str | None = None, limit: int | None = 100) -> pd.DataFrame:
+        """
+        Finds the items matching every word or "quoted phrase" of `text`, best score first.
+
+        Args:
+            text: The query, e.g. 'computer vision' (both words) or '"computer vision"' (the phrase).
+            start, end: Inclusive date bounds, or None.
+            min_score: Minimum Signal Score, or None.
+            kind: 'funding' or 'launch' to keep only that kind of item, or None.
+            corpus: 'history' or 'live' to search only one corpus, or None for both.
+            limit: Maximum number of results, or None for all of them.
+        """
+        query = to_fts_query(text)
+        columns = ['date', 'corpus', 'source', 'company', 'title', 'signal_score', 'tier', 'kind']
+        if not query:
+            return pd.DataFrame(columns=columns)
+
+        conditions, params = ["docs_fts MATCH ?"], [query]
+        if start is not None:
+            conditions.append("d.date >= ?")
+            params.append(pd.Timestamp(start).strftime('%Y-%m-%d'))
+        if end is not None:
+            conditions.append("d.date <= ?")
+            params.append(pd.Timestamp(end).strftime('%Y-%m-%d'))
+        if min_score is not None:
+            conditions.append("d.signal_score >= ?")
+            params.append(float(min_score))
+        if kind is not None:
+            conditions.append("d.kind = ?")
+            params.append(kind)
+        if corpus is not None:
+            conditions.append("d.corpus = ?")
+            params.append(corpus)
+
+        with self._lock:
+            results = pd.read_sql_query(
+                f"SELECT {', '.join('d.' + column for column in columns)} "
+                f"FROM docs_fts JOIN docs d ON d.rowid = docs_fts.rowid "
+                f"WHERE {' AND '.join(conditions)} "
+                f"ORDER BY d.signal_score DESC, d.date DESC LIMIT ?",
+                self._conn, params=params + [-1 if limit is None else limit]
+            )
+        results['date'] = pd.to_datetime(results['date'])
+        return results.rename(columns={'signal_score': 'Signal Score', 'tier': 'Tier', 'company': 'company_name'})
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
@@ -0,0 +1,243 @@
+# core/signals.py
+"""
+Running per-company signal statistics for the Live Tracker, updated as items arrive.
+
+Each company ID (see core.entities) indexes a slot in a few flat arrays: its best score,
+an exponentially time-decayed sum of its scores, its mention counts (in total and per
+day over a rolling window) and a bitset of the sources that mentioned it. Folding in a
+batch of mentions only touches the companies it mentions, so the ranking stays current
+under continuous ingestion without recomputing anything over past mentions.
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from core import entities, scoring, tracing
+from core.cache import save_npz
+
+LIVE_SIGNALS_PATH = os.path.join(".signal_data", "live_signals.npz")
+
+# A mention's weight in the decayed score halves every this many days
+HALF_LIFE_DAYS = 3.0
+# Recent mentions are counted over this many days, in one bucket per day
+ROLLING_DAYS = 7
+
+# Sources are bits of a uint64 bitset
+MAX_SOURCES = 64
+
+_DAY_NS = 86_400 * 10**9
+
+
+def _days_of(df: pd.DataFrame) -> np.ndarray:
+    """Each mention's time in (fractional) days since the epoch, from 'first_seen' (or 'date'; else now)."""
+    if 'first_seen' in df.columns or 'date' in df.columns:
+        times = pd.to_datetime(df['first_seen'] if 'first_seen' in df.columns else df['date'], utc=True)
+        nanoseconds = times.dt.tz_localize(None).to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    else:
+        nanoseconds = np.full(len(df), pd.Timestamp.now(tz='UTC').value, dtype=np.int64)
+    return nanoseconds / _DAY_NS
+
+
+def _day_of(timestamp) -> float:
+    """A timestamp (naive ones are taken as UTC) in fractional days since the epoch."""
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize('UTC')
+    return timestamp.value / _DAY_NS
+
+
+class CompanySignals:
+    """
+    Per-company signal state in arrays indexed by company ID.
+
+    The decayed score of a company is kept as of the last time it was updated and is
+    brought forward to any query time with one multiplication, so both folding a batch
+    and ranking every company are single vectorized passes. Mention times only need to
+    be roughly in order: older mentions simply weigh less.
+    """
+
+    def __init__(self, half_life_days: float = HALF_LIFE_DAYS, rolling_days: int = ROLLING_DAYS):
+        self.half_life_days = half_life_days
+        self.rolling_days = rolling_days
+        self.sources = []
+        self.clock = -np.inf  # Time of the latest mention, in days since the epoch
+        self.items = 0
+        self._lock = threading.Lock()
+        # slot_days[s] is the day whose mentions bucket s of `recent` counts (-1: none yet)
+        self.slot_days = np.full(rolling_days, -1, dtype=np.int64)
+        self._allocate(0)
+
+    def _allocate(self, capacity: int):
+        self.max_score = np.zeros(capacity, dtype=np.float32)
+        self.decayed = np.zeros(capacity, dtype=np.float64)
+        self.updated = np.zeros(capacity, dtype=np.float64)
+        self.mentions = np.zeros(capacity, dtype=np.int64)
+        self.recent = np.zeros((capacity, self.rolling_days), dtype=np.int32)
+        self.source_bits = np.zeros(capacity, dtype=np.uint64)
+
+    def _grow(self, max_id: int):
+        """Makes room for company IDs up to `max_id`, doubling the capacity as needed."""
+        capacity = len(self.mentions)
+        if max_id < capacity:
+            return
+        old = (self.max_score, self.decayed, self.updated, self.mentions, self.recent, self.source_bits)
+        self._allocate(max(max_id + 1, 2 * capacity, 1024))
+        for new, values in zip((self.max_score, self.decayed, self.updated, self.mentions, self.recent,
+                                self.source_bits), old):
+            new[:capacity] = values
+
+    def _source_bits(self, sources: pd.Series) -> np.ndarray:
+        """The bit of each mention's source, registering sources not seen before."""
+        names = pd.Index(pd.unique(sources.dropna()))
+        self.sources.extend(name for name in names if name not in self.sources)
+        if len(self.sources) > MAX_SOURCES:
+            raise ValueError(f"At most {MAX_SOURCES} distinct sources are supported, got {len(self.sources)}")
+        codes = pd.Index(self.sources).get_indexer(sources)
+        return np.where(codes >= 0, np.left_shift(np.uint64(1), codes.astype(np.uint64)), np.uint64(0))
+
+    def _advance(self, day: int):
+        """Moves the rolling window forward to end on `day`, emptying the buckets of days it drops."""
+        slots = np.arange(self.rolling_days)
+        # The day each bucket counts once the window ends on `day`
+        days = day - (day - slots) % self.rolling_days
+        stale = self.slot_days != days
+        self.recent[:, stale] = 0
+        self.slot_days = days
+
+    @tracing.traced('signals.add', rows_in=lambda self, mentions: len(mentions))
+    def add(self, mentions: pd.DataFrame):
+        """
+        Folds in a batch of mentions: rows with a 'company_id' (negative IDs are skipped),
+        'Signal Score', 'source' and 'first_seen' (or 'date').
+        """
+        mentions = mentions[mentions['company_id'].to_numpy() >= 0]
+        if mentions.empty:
+            return self
+
+        ids = mentions['company_id'].to_numpy(dtype=np.int64)
+        scores = mentions['Signal Score'].to_numpy(dtype=np.float64)
+        times = _days_of(mentions)
+        bits = self._source_bits(mentions['source'])
+        self._grow(int(ids.max()))
+
+        self.clock = max(self.clock, float(times.max()))
+        today = int(np.floor(self.clock))
+        if self.slot_days[today % self.rolling_days] != today:
+            self._advance(today)
+
+        # One reduction per statistic over the batch's distinct companies
+        companies, position = np.unique(ids, return_inverse=True)
+        batch_max = np.full(len(companies), -np.inf)
+        np.maximum.at(batch_max, position, scores)
+        self.max_score[companies] = np.maximum(self.max_score[companies], batch_max)
+        self.mentions[companies] += np.bincount(position, minlength=len(companies))
+        batch_bits = np.zeros(len(companies), dtype=np.uint64)
+        np.bitwise_or.at(batch_bits, position, bits)
+        self.source_bits[companies] |= batch_bits
+
+        # Bring the companies' decayed scores and the batch's mentions forward to the clock
+        contribution = np.bincount(position, weights=scores * self._decay(self.clock - times),
+                                   minlength=len(companies))
+        self.decayed[companies] = self.decayed[companies] * self._decay(self.clock - self.updated[companies]) + contribution
+        self.updated[companies] = self.clock
+
+        days = np.floor(times).astype(np.int64)
+        in_window = days > today - self.rolling_days
+        cells, counts = np.unique(ids[in_window] * self.rolling_days + days[in_window] % self.rolling_days,
+                                  return_counts=True)
+        self.recent.ravel()[cells] += counts.astype(np.int32)
+        return self
+
+    def add_new(self, df: pd.DataFrame, registry: entities.CompanyRegistry, offset: int = 0) -> int:
+        """
+        Folds in the scored rows of an append-only item frame (e.g., the item store's
+        rows from `offset` on, with a 'Companies' list column) past the ones already
+        folded in, and returns how many were added.
+
+        Rows are taken up to the first one not scored yet, so items an interrupted run
+        left unprocessed are folded in once they are scored. Concurrent callers reading
+        the same rows fold them in once.
+        """
+        with self._lock:
+            new = df.iloc[self.items - offset:]
+            scored = new['Signal Score'].notna().to_numpy()
+            if not scored.all():
+                new = new.iloc[:int(np.argmin(scored))]
+            if new.empty:
+                return 0
+
+            mentions = new.explode('Companies').rename(columns={'Companies': 'company_name'})
+            mentions = mentions.dropna(subset=['company_name'])
+            self.add(mentions.assign(company_id=registry.resolve(mentions['company_name'])))
+            self.items += len(new)
+            return len(new)
+
+    def _decay(self, elapsed_days) -> np.ndarray:
+        return np.exp2(-np.asarray(elapsed_days) / self.half_life_days)
+
+    def decayed_scores(self, now=None) -> np.ndarray:
+        """Every company's decayed score as of `now` (a timestamp; by default the latest mention)."""
+        at = self.clock if now is None else _day_of(now)
+        return self.decayed * self._decay(at - self.updated)
+
+    def recent_mentions(self, now=None) -> np.ndarray:
+        """Every company's mentions over the `rolling_days` days up to `now`."""
+        day = int(np.floor(self.clock if now is None else _day_of(now)))
+        live = (self.slot_days > day - self.rolling_days) & (self.slot_days <= day)
+        return self.recent[:, live].sum(axis=1)
+
+    @tracing.traced('signals.top_k', rows_out=len)
+    def top_k(self, k: int | None = 20, now=None, registry: entities.CompanyRegistry | None = None) -> pd.DataFrame:
+        """
+        The k companies with the highest decayed score as of `now` (all of them if k is None).
+
+        Returns one row per company, best first, with its ID, decayed and best scores,
+        the tier of its best score, mention counts and sources; indexed by display name
+        when a `registry` is given.
+        """
+        decayed = self.decayed_scores(now)
+        ids = np.flatnonzero(self.mentions)
+        if k is not None and k < len(ids):
+            ids = ids[np.argpartition(-decayed[ids], k - 1)[:k]]
+        ids = ids[np.lexsort((ids, -decayed[ids]))]
+
+        best = self.max_score[ids].astype(float).round(1)
+        bits = self.source_bits[ids]
+        decoded = {mask: [name for i, name in enumerate(self.sources) if int(mask) >> i & 1] for mask in pd.unique(bits)}
+        companies = pd.DataFrame({
+            'Decayed_Score': decayed[ids].round(1),
+            'Signal_Score': best,
+            'Tier': pd.Series(best).map(scoring.get_signal_tier).astype(scoring.TIER_DTYPE).to_numpy(),
+            'Mentions': self.mentions[ids],
+            f'Mentions_{self.rolling_days}d': self.recent_mentions(now)[ids],
+            'Sources': [decoded[mask] for mask in bits],
+        }, index=pd.Index(ids, name='company_id'))
+        if registry is None:
+            return companies.reset_index()
+        return registry.index_by_name(companies)
+
+    def save(self, path: str = LIVE_SIGNALS_PATH):
+        """
+        Writes the state to an .npz file. The file is replaced atomically, under the
+        state's lock, so concurrent saves never leave it torn or mid-update.
+        """
+        with self._lock:
+            save_npz(path, max_score=self.max_score, decayed=self.decayed, updated=self.updated,
+                     mentions=self.mentions, recent=self.recent, source_bits=self.source_bits,
+                     slot_days=self.slot_days, sources=np.array(self.sources, dtype=str), clock=self.clock,
+                     items=self.items, half_life_days=self.half_life_days)
+
+    @classmethod
+    def load(cls, path: str = LIVE_SIGNALS_PATH):
+        """Reads the state written by `save`, or returns None if there is none."""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            signals = cls(float(data['half_life_days']), data['recent'].shape[1])
+            signals.max_score, signals.decayed, signals.updated = data['max_score'], data['decayed'], data['updated']
+            signals.mentions, signals.recent, signals.source_bits = data['mentions'], data['recent'], data['source_bits']
+            signals.slot_days, signals.sources = data['slot_days'], data['sources'].tolist()
+            signals.clock, signals.items = float(data['clock']), int(data['items'])
+            return signals
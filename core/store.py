@@ -0,0 +1,158 @@
+# core/store.py
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from core import ner, schema, scoring, tracing
+from core.cache import content_key
+
+ITEM_STORE_PATH = os.path.join(".signal_data", "items.sqlite")
+
+
+def item_key(source, title, description) -> str:
+    """Content hash identifying a scraped item by its source, title and description."""
+    return content_key(source, title, description)
+
+
+class ItemStore:
+    """
+    A persistent local store of scraped items, deduplicated by content hash.
+
+    Each item keeps the time it was first seen together with its NER and scoring
+    results, so a refresh only has to process the items it has never seen before.
+    """
+
+    def __init__(self, path: str = ITEM_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS items ("
+                "item_id TEXT PRIMARY KEY, source TEXT, title TEXT, description TEXT, "
+                "first_seen TEXT NOT NULL, companies TEXT, signal_score REAL, tier TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_items_first_seen ON items (first_seen)")
+
+    def add_new(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Inserts the rows of `df` that are not in the store yet.
+
+        Returns:
+            The newly inserted rows, with their `item_id` and `first_seen` columns.
+        """
+        if df.empty:
+            return pd.DataFrame(columns=['item_id', 'source', 'title', 'description', 'first_seen'])
+
+        new_df = df[['source', 'title', 'description']].copy()
+        new_df['item_id'] = [
+            item_key(source, title, description)
+            for source, title, description in zip(new_df['source'], new_df['title'], new_df['description'])
+        ]
+        # Items repeated within the same scrape count once
+        new_df = new_df.drop_duplicates('item_id')
+
+        with self._lock:
+            existing = set()
+            ids = new_df['item_id'].tolist()
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                existing.update(row[0] for row in self._conn.execute(
+                    f"SELECT item_id FROM items WHERE item_id IN ({placeholders})", chunk
+                ))
+            new_df = new_df[~new_df['item_id'].isin(existing)].copy()
+            new_df['first_seen'] = datetime.now(timezone.utc).isoformat()
+
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO items (item_id, source, title, description, first_seen) VALUES (?, ?, ?, ?, ?)",
+                    new_df[['item_id', 'source', 'title', 'description', 'first_seen']].itertuples(index=False, name=None)
+                )
+        return new_df.reset_index(drop=True)
+
+    def pending(self) -> pd.DataFrame:
+        """Returns the items that have not been through NER and scoring yet."""
+        with self._lock:
+            return pd.read_sql_query(
+                "SELECT item_id, source, title, description, first_seen FROM items "
+                "WHERE signal_score IS NULL ORDER BY rowid",
+                self._conn
+            )
+
+    def save_results(self, item_ids, companies, scores, tiers):
+        """Stores the NER and scoring results for the given items."""
+        rows = [
+            (json.dumps(list(names)), float(score), tier, item_id)
+            for item_id, names, score, tier in zip(item_ids, companies, scores, tiers)
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE items SET companies = ?, signal_score = ?, tier = ? WHERE item_id = ?", rows
+            )
+
+    def load(self, offset: int = 0) -> pd.DataFrame:
+        """
+        Returns every stored item in insertion (rowid) order, with its companies, score and tier.
+        Items are only ever appended and rowids only grow, even with several processes
+        writing (unlike `first_seen`, each writer's wall-clock time), so `offset` skips
+        exactly the items a caller has already read.
+        """
+        with self._lock:
+            df = pd.read_sql_query(
+                "SELECT item_id, source, title, description, first_seen, companies, signal_score, tier "
+                "FROM items ORDER BY rowid LIMIT -1 OFFSET ?",
+                self._conn, params=(offset,)
+            )
+        df['companies'] = [json.loads(names) if names else [] for names in df['companies']]
+        df['first_seen'] = pd.to_datetime(df['first_seen'], utc=True)
+        df = df.rename(columns={'companies': 'Companies', 'signal_score': 'Signal Score', 'tier': 'Tier'})
+        return schema.compact(df)
+
+    def fingerprint(self) -> tuple:
+        """
+        A cheap version stamp of the store's contents. Items are only ever added and
+        then enriched, so counts of rows and of scored rows change whenever the data does.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*), MAX(rowid), COUNT(signal_score) FROM items"
+            ).fetchone()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+
+@tracing.traced('store.ingest', rows_out=len)
+def ingest(store: ItemStore, df: pd.DataFrame, n_process: int = 1) -> pd.DataFrame:
+    """
+    Adds freshly scraped items to the store and runs NER and scoring on the new ones only
+    (plus any item an interrupted earlier run left unprocessed). NER runs on `n_process`
+    worker processes (see `ner.extract_company_names_batch`).
+
+    Returns:
+        The processed items with their 'Companies', 'Signal Score' and 'Tier' columns.
+    """
+    store.add_new(df)
+    new_df = store.pending()
+    if new_df.empty:
+        return new_df
+
+    new_df['Companies'] = pd.Series(
+        ner.extract_company_names_batch(new_df['title'] + ' ' + new_df['description'], n_process=n_process),
+        index=new_df.index, dtype=object
+    )
+    new_df['Signal Score'], new_df['Tier'] = scoring.score_frame(new_df)
+    store.save_results(new_df['item_id'], new_df['Companies'], new_df['Signal Score'], new_df['Tier'])
+    return schema.compact(new_df)
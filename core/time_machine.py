@@ -0,0 +1,56 @@
+# core/time_machine.py
+import numpy as np
+import pandas as pd
+
+from core import scoring
+
+
+class TimeMachineIndex:
+    """
+    Answers "top-k signals as of date D" without rescanning the history.
+
+    Scores don't depend on the selected date, so they are computed once and the rows
+    are kept sorted by date. For every distinct day the index stores a snapshot of the
+    top-k rows published up to and including that day, built incrementally by merging
+    each day's rows into the previous snapshot. A query is then a binary search over
+    the days plus a lookup of at most k rows.
+
+    Ties on score are broken by publication order (earlier rows first).
+    """
+
+    def __init__(self, df: pd.DataFrame, k: int = 10):
+        self.k = k
+
+        frame = df.sort_values('date', kind='stable', ignore_index=True)
+        if 'Signal Score' not in frame.columns or 'Tier' not in frame.columns:
+            frame['Signal Score'], frame['Tier'] = scoring.score_frame(frame)
+        self.frame = frame
+
+        dates = frame['date'].to_numpy(dtype='datetime64[ns]')
+        self.days, day_starts = np.unique(dates.astype('datetime64[D]'), return_index=True)
+        day_ends = np.append(day_starts[1:], len(frame))
+        scores = frame['Signal Score'].to_numpy(dtype=float)
+
+        # snapshots[i] holds the row positions of the top-k rows up to self.days[i], -1 padded
+        self.snapshots = np.full((len(self.days), k), -1, dtype=np.int64)
+        top = np.empty(0, dtype=np.int64)
+        for i, (begin, end) in enumerate(zip(day_starts, day_ends)):
+            candidates = np.concatenate([top, np.arange(begin, end, dtype=np.int64)])
+            # Highest score first, then earliest position
+            order = np.lexsort((candidates, -scores[candidates]))
+            top = candidates[order[:k]]
+            self.snapshots[i, :len(top)] = top
+
+    def top_k(self, as_of, k: int | None = None) -> pd.DataFrame:
+        """
+        Returns the top-k scored rows published on or before `as_of`, best first.
+        """
+        k = self.k if k is None else min(k, self.k)
+        day = np.datetime64(pd.Timestamp(as_of).normalize(), 'D')
+        i = np.searchsorted(self.days, day, side='right') - 1
+        if i < 0:
+            return self.frame.iloc[0:0]
+        positions = self.snapshots[i, :k]
+        rows = self.frame.iloc[positions[positions >= 0]]
+        # Compact frames hold float32 scores; show them as the one-decimal scores they are
+        return rows.assign(**{'Signal Score': rows['Signal Score'].astype(float).round(1)})
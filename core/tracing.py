@@ -0,0 +1,191 @@
+# core/tracing.py
+import contextvars
+import cProfile
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
+
+# The span being recorded in the current thread / asyncio task, so code deep inside
+# a traced stage can add cache hits and misses to it
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+class Tracer:
+    """
+    Records per-stage timings (wall time, rows processed, cache hits and misses) for
+    the most recent `max_spans` stage runs, shared by every session in the process.
+    """
+
+    def __init__(self, max_spans: int = 2_000):
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, stage: str, rows: int | None = None):
+        """
+        Times the enclosed block as one run of `stage`. Yields the span record, whose
+        'rows', 'cache_hits' and 'cache_misses' the block may fill in.
+        """
+        record = {'stage': stage, 'started_at': time.time(), 'seconds': None, 'rows': rows,
+                  'cache_hits': 0, 'cache_misses': 0, 'error': None}
+        token = _current_span.set(record)
+        started = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record['error'] = type(e).__name__
+            raise
+        finally:
+            record['seconds'] = time.perf_counter() - started
+            _current_span.reset(token)
+            with self._lock:
+                self._spans.append(record)
+
+    def spans(self) -> list[dict]:
+        """The recorded spans, oldest first."""
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+    def summary(self) -> pd.DataFrame:
+        """One row per stage: number of runs, total and last wall time, rows and cache counters."""
+        spans = pd.DataFrame(self.spans(), columns=['stage', 'started_at', 'seconds', 'rows',
+                                                    'cache_hits', 'cache_misses', 'error'])
+        if spans.empty:
+            return pd.DataFrame(columns=['runs', 'total_s', 'last_s', 'rows', 'cache_hits', 'cache_misses'])
+        return spans.groupby('stage').agg(
+            runs=('seconds', 'size'),
+            total_s=('seconds', 'sum'),
+            last_s=('seconds', 'last'),
+            rows=('rows', 'sum'),
+            cache_hits=('cache_hits', 'sum'),
+            cache_misses=('cache_misses', 'sum')
+        ).sort_values('total_s', ascending=False)
+
+    def to_jsonl(self, path: str | None = None) -> str:
+        """Exports every span as one JSON object per line (also written to `path` if given)."""
+        text = ''.join(json.dumps(span) + '\n' for span in self.spans())
+        if path:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+    def to_prometheus(self, path: str | None = None) -> str:
+        """Exports per-stage counters in the Prometheus text format (also written to `path` if given)."""
+        summary = self.summary()
+        metrics = [
+            ('signal_stage_runs_total', 'runs', 'Number of times the stage ran.'),
+            ('signal_stage_seconds_total', 'total_s', 'Wall time spent in the stage.'),
+            ('signal_stage_rows_total', 'rows', 'Rows processed by the stage.'),
+            ('signal_stage_cache_hits_total', 'cache_hits', 'Cache hits inside the stage.'),
+            ('signal_stage_cache_misses_total', 'cache_misses', 'Cache misses inside the stage.'),
+        ]
+        lines = []
+        for name, column, help_text in metrics:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for stage, value in summary[column].items():
+                lines.append(f'{name}{{stage="{stage}"}} {float(value):g}')
+        text = '\n'.join(lines) + '\n'
+        if path:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+
+TRACER = Tracer()
+
+
+def span(stage: str, rows: int | None = None):
+    """Times a block as one run of `stage` on the shared tracer."""
+    return TRACER.span(stage, rows=rows)
+
+
+def record_rows(rows: int):
+    """Sets the number of rows processed by the stage currently being traced, if any."""
+    record = _current_span.get()
+    if record is not None:
+        record['rows'] = rows
+
+
+def record_cache(hits: int = 0, misses: int = 0):
+    """Adds cache hits and misses to the stage currently being traced, if any."""
+    record = _current_span.get()
+    if record is not None:
+        record['cache_hits'] += hits
+        record['cache_misses'] += misses
+
+
+def traced(stage: str, rows_in=None, rows_out=None):
+    """
+    Decorator recording each call of a function (sync or async) as a run of `stage`.
+
+    Args:
+        stage: The stage name shown in the performance panel.
+        rows_in: Optional callable taking the call's arguments and returning the rows it processes.
+        rows_out: Optional callable taking the result and returning the rows it produced.
+    """
+    def decorator(func):
+        def rows_for(args, kwargs):
+            return rows_in(*args, **kwargs) if rows_in else None
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(stage, rows=rows_for(args, kwargs)) as record:
+                    result = await func(*args, **kwargs)
+                    if rows_out:
+                        record['rows'] = rows_out(result)
+                    return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage, rows=rows_for(args, kwargs)) as record:
+                result = func(*args, **kwargs)
+                if rows_out:
+                    record['rows'] = rows_out(result)
+                return result
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def profile_run(path: str):
+    """Runs the enclosed block under cProfile and dumps the stats to `path` (view with pstats or snakeviz)."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"Wrote cProfile stats to {path}")
+
+
+# Set SIGNAL_PROFILE=<path> to dump a cProfile of the first app run in the process
+PROFILE_ENV_VAR = 'SIGNAL_PROFILE'
+_profiled = False
+
+
+def profile_once_from_env():
+    """
+    Returns a `profile_run` context if SIGNAL_PROFILE is set and no run has been profiled
+    yet in this process, and a no-op context otherwise.
+    """
+    global _profiled
+    path = os.environ.get(PROFILE_ENV_VAR)
+    if not path or _profiled:
+        return nullcontext()
+    _profiled = True
+    return profile_run(path)
@@ -0,0 +1,287 @@
+# core/trends.py
+"""
+A term x week count matrix over news items, for keyword momentum charts.
+
+Every item is tokenized once (lowercased, split on anything that isn't a letter or
+digit, so "ai" never matches inside "email"), and each unigram and bigram it contains
+is counted once in the item's week. Keyword trends, rolling windows and week-over-week
+bursts are then answered from the counts without touching the text again.
+"""
+import os
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from core import tracing
+from core.cache import save_npz
+
+TRENDS_PATH = os.path.join(".signal_data", "trends.npz")
+LIVE_TRENDS_PATH = os.path.join(".signal_data", "live_trends.npz")
+
+# Words too common to be news on their own; excluded from bursts
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in into is it its of on or our the their this to was we with'.split()
+)
+
+# Keywords charted by default
+DEFAULT_TERMS = ['AI', 'LLM', 'fintech', 'climate', 'robotics', 'computer vision', 'platform']
+
+# Terms are single words or two-word phrases ("computer vision")
+MAX_TERM_WORDS = 2
+
+# Items are tokenized this many at a time to bound the memory of the token arrays
+ADD_CHUNK_ROWS = 200_000
+# A chunk's (term, week) counts are tallied in a dense array up to this many cells
+_DENSE_CELLS = 1 << 24
+
+_SPLIT_PATTERN = r'[^\p{L}\p{N}]+'
+_WORD = re.compile(r'[^\W_]+')
+# Week numbers are days since the epoch // 7, shifted so weeks start on Monday
+_EPOCH_MONDAY = np.datetime64('1969-12-29')
+
+
+def normalize_term(term: str) -> str:
+    """The form a keyword is counted under: lowercase words joined by single spaces."""
+    words = _WORD.findall(term.lower())
+    if not words or len(words) > MAX_TERM_WORDS:
+        raise ValueError(f"Trend terms must have 1 to {MAX_TERM_WORDS} words, got {term!r}")
+    return ' '.join(words)
+
+
+def count_mentions(texts: pd.Series, terms) -> np.ndarray:
+    """
+    How many of `texts` mention each term as whole words, for one-off counts where
+    building a cube isn't worth it. Words are delimited exactly as in the cube's
+    tokenizer (anything but a letter or digit, including '_'), and the words of a phrase
+    may be separated by any run of such characters.
+    """
+    # One contiguous Arrow array (a chunked one would recompile each pattern per chunk),
+    # lowercased and matched in RE2 like the cube's split
+    corpus = pc.utf8_lower(pa.array(texts.fillna('').astype(str).tolist(), type=pa.string()))
+    patterns = [
+        f'(?:^|{_SPLIT_PATTERN})' + _SPLIT_PATTERN.join(map(re.escape, normalize_term(term).split(' '))) + f'(?:{_SPLIT_PATTERN}|$)'
+        for term in terms
+    ]
+    return np.array([pc.sum(pc.match_substring_regex(corpus, pattern)).as_py() or 0 for pattern in patterns])
+
+
+def _weeks_of(df: pd.DataFrame) -> np.ndarray:
+    """Each item's week number, from its 'date' (or 'first_seen'; items without either count as this week)."""
+    if 'date' in df.columns or 'first_seen' in df.columns:
+        dates = pd.to_datetime(df['date'] if 'date' in df.columns else df['first_seen'], utc=True)
+        days = dates.dt.tz_localize(None).to_numpy(dtype='datetime64[D]')
+    else:
+        days = np.full(len(df), np.datetime64(pd.Timestamp.now(tz='UTC').date(), 'D'))
+    return ((days - _EPOCH_MONDAY).astype(np.int64) // 7).astype(np.int32)
+
+
+def week_start(week: int) -> pd.Timestamp:
+    """The Monday a week number starts on."""
+    return pd.Timestamp(_EPOCH_MONDAY + np.timedelta64(int(week) * 7, 'D'))
+
+
+class TrendCube:
+    """
+    Sparse counts of the items mentioning each term in each week.
+
+    The non-zero cells are kept as three parallel arrays (term id, week, count) sorted
+    by term then week, so one term's series is a contiguous slice and one week's
+    column is a single vectorized mask. New items are folded in incrementally.
+    """
+
+    def __init__(self):
+        self.terms = pd.Index([], dtype=object)
+        self.term_ids = np.empty(0, dtype=np.int32)
+        self.weeks = np.empty(0, dtype=np.int32)
+        self.counts = np.empty(0, dtype=np.int32)
+        self.items = 0
+        # Shared cubes are updated from several sessions; re-entrant because add_new calls add
+        self._lock = threading.RLock()
+
+    @tracing.traced('trends.add', rows_in=lambda self, df: len(df))
+    def add(self, df: pd.DataFrame):
+        """Counts the terms of new items (with 'title', 'description' and a date column) into the cube."""
+        with self._lock:
+            for start in range(0, len(df), ADD_CHUNK_ROWS):
+                self._add_chunk(df.iloc[start:start + ADD_CHUNK_ROWS])
+            self.items += len(df)
+        return self
+
+    def add_new(self, df: pd.DataFrame) -> int:
+        """
+        Counts the rows of an append-only frame (e.g., the item store) past the ones
+        already counted, and returns how many were added. Concurrent callers passing
+        the same rows count them once.
+        """
+        with self._lock:
+            new = df.iloc[self.items:]
+            if len(new):
+                self.add(new)
+            return len(new)
+
+    def _add_chunk(self, df: pd.DataFrame):
+        text = (df['title'].fillna('').astype(str) + ' ' + df['description'].fillna('').astype(str)).tolist()
+        tokens = pc.split_pattern_regex(pc.utf8_lower(pa.array(text, type=pa.string())), pattern=_SPLIT_PATTERN)
+        words = pc.list_flatten(tokens)
+        rows = pc.list_parent_indices(tokens).to_numpy()
+
+        # Bigrams join each word to the next one of the same item
+        same_item = rows[:-1] == rows[1:]
+        firsts = pc.filter(words.slice(0, len(words) - 1), pa.array(same_item))
+        seconds = pc.filter(words.slice(1), pa.array(same_item))
+        bigrams = pc.binary_join_element_wise(firsts, seconds, ' ')
+
+        terms = pa.concat_arrays([words, bigrams])
+        term_rows = np.concatenate([rows, rows[:-1][same_item]])
+        keep = pc.not_equal(pc.utf8_length(words), 0).to_numpy(zero_copy_only=False)
+        keep = np.concatenate([keep, np.ones(len(bigrams), dtype=bool)])
+        # Bigrams of an empty token (leading/trailing punctuation) start or end with a space
+        keep[len(words):] &= ~pc.or_(pc.starts_with(bigrams, ' '), pc.ends_with(bigrams, ' ')).to_numpy(
+            zero_copy_only=False)
+
+        encoded = pc.dictionary_encode(pc.filter(terms, pa.array(keep)))
+        local_ids = encoded.indices.to_numpy()
+        term_rows = term_rows[keep]
+
+        # Count each term once per item (a sort is much faster than a hash set at this size)
+        vocabulary = pd.Index(encoded.dictionary.to_pylist(), dtype=object)
+        mentions = np.sort(term_rows.astype(np.int64) * len(vocabulary) + local_ids)
+        mentions = mentions[np.r_[True, mentions[1:] != mentions[:-1]]]
+
+        # ...then per (term, week), collapsing the chunk to its non-zero cells before merging
+        item_weeks = _weeks_of(df)
+        first_week = item_weeks.min()
+        span = int(item_weeks.max() - first_week + 1)
+        cells = (mentions % len(vocabulary)) * span + (item_weeks[mentions // len(vocabulary)] - first_week)
+        if len(vocabulary) * span <= _DENSE_CELLS:
+            counts = np.bincount(cells, minlength=len(vocabulary) * span)
+            cells = np.flatnonzero(counts)
+            counts = counts[cells]
+        else:
+            cells, counts = np.unique(cells, return_counts=True)
+        ids = self._term_ids_for(vocabulary)[cells // span]
+        self._merge(ids, (cells % span + first_week).astype(np.int32), counts.astype(np.int32))
+
+    def _term_ids_for(self, vocabulary: pd.Index) -> np.ndarray:
+        """Global ids of a chunk's terms, registering terms never seen before."""
+        ids = self.terms.get_indexer(vocabulary)
+        unseen = ids < 0
+        if unseen.any():
+            ids[unseen] = np.arange(len(self.terms), len(self.terms) + unseen.sum())
+            self.terms = self.terms.append(vocabulary[unseen])
+        return ids.astype(np.int32)
+
+    def _merge(self, term_ids: np.ndarray, weeks: np.ndarray, counts: np.ndarray):
+        """Adds (term, week, count) cells to the cube, summing cells that coincide."""
+        term_ids = np.concatenate([self.term_ids, term_ids]).astype(np.int64)
+        weeks = np.concatenate([self.weeks, weeks]).astype(np.int64)
+        keys = (term_ids << 32) | (weeks & 0xFFFFFFFF)
+        cells, inverse = np.unique(keys, return_inverse=True)
+        self.counts = np.bincount(inverse, weights=np.concatenate([self.counts, counts]),
+                                  minlength=len(cells)).astype(np.int32)
+        self.term_ids = (cells >> 32).astype(np.int32)
+        self.weeks = (cells & 0xFFFFFFFF).astype(np.uint32).view(np.int32)
+
+    def series(self, terms, start=None, end=None) -> pd.DataFrame:
+        """
+        Weekly mention counts of each term, one column per term and one row per week
+        (indexed by the week's Monday), with weeks that have no mentions filled with 0.
+        """
+        terms = list(terms)
+        if len(self.weeks) == 0:
+            return pd.DataFrame(columns=terms, dtype=int)
+        first = self.weeks.min() if start is None else _weeks_of(pd.DataFrame({'date': [start]}))[0]
+        last = self.weeks.max() if end is None else _weeks_of(pd.DataFrame({'date': [end]}))[0]
+        if last < first:
+            return pd.DataFrame(columns=terms, dtype=int)
+
+        matrix = np.zeros((last - first + 1, len(terms)), dtype=np.int64)
+        ids = self.terms.get_indexer([normalize_term(term) for term in terms])
+        bounds = np.searchsorted(self.term_ids, np.stack([ids, ids + 1]))
+        for column, (id_, begin, stop) in enumerate(zip(ids, *bounds)):
+            if id_ < 0:
+                continue
+            weeks, counts = self.weeks[begin:stop], self.counts[begin:stop]
+            inside = (weeks >= first) & (weeks <= last)
+            matrix[weeks[inside] - first, column] = counts[inside]
+
+        index = pd.DatetimeIndex([week_start(week) for week in range(first, last + 1)], name='week')
+        return pd.DataFrame(matrix, index=index, columns=terms)
+
+    def rolling(self, terms, window: int = 4, start=None, end=None) -> pd.DataFrame:
+        """Mentions of each term over the trailing `window` weeks, week by week."""
+        return self.series(terms, start, end).rolling(window, min_periods=1).sum().astype(int)
+
+    def totals(self, terms) -> pd.DataFrame:
+        """All-time mention counts of each term, as a Keyword/Mentions table."""
+        ids = self.terms.get_indexer([normalize_term(term) for term in terms])
+        per_term = np.bincount(self.term_ids, weights=self.counts, minlength=len(self.terms))
+        mentions = [int(per_term[id_]) if id_ >= 0 else 0 for id_ in ids]
+        return pd.DataFrame({'Keyword': list(terms), 'Mentions': mentions})
+
+    def bursts(self, week=None, min_mentions: int = 5, limit: int = 10) -> pd.DataFrame:
+        """
+        The terms whose mentions grew the most from the previous week to `week` (the latest
+        week by default), among terms with at least `min_mentions` that week. Growth is the
+        ratio of the two weeks' counts, each smoothed by one mention.
+        """
+        columns = ['Term', 'This Week', 'Last Week', 'Change', 'Growth']
+        if len(self.weeks) == 0:
+            return pd.DataFrame(columns=columns)
+        week = self.weeks.max() if week is None else _weeks_of(pd.DataFrame({'date': [week]}))[0]
+
+        this_week = np.bincount(self.term_ids[self.weeks == week], weights=self.counts[self.weeks == week],
+                                minlength=len(self.terms))
+        last_week = np.bincount(self.term_ids[self.weeks == week - 1], weights=self.counts[self.weeks == week - 1],
+                                minlength=len(self.terms))
+        candidates = np.flatnonzero(this_week >= min_mentions)
+        # Skip terms made only of stopwords ("for", "of the"), which rise and fall with volume
+        informative = [not STOPWORDS.issuperset(term.split(' ')) for term in self.terms[candidates]]
+        candidates = candidates[np.array(informative, dtype=bool)]
+        growth = (this_week[candidates] + 1) / (last_week[candidates] + 1)
+        top = candidates[np.argsort(-growth, kind='stable')[:limit]]
+        return pd.DataFrame({
+            'Term': self.terms[top],
+            'This Week': this_week[top].astype(int),
+            'Last Week': last_week[top].astype(int),
+            'Change': (this_week[top] - last_week[top]).astype(int),
+            'Growth': (this_week[top] + 1) / (last_week[top] + 1),
+        }, columns=columns)
+
+    def save(self, path: str = TRENDS_PATH, fingerprint=None):
+        """
+        Writes the cube to an .npz file, tagged with the fingerprint of the data it covers.
+        The file is replaced atomically, under the cube's lock, so it is never torn or mid-update.
+        """
+        with self._lock:
+            save_npz(path, terms=np.array(self.terms, dtype=str), term_ids=self.term_ids, weeks=self.weeks,
+                     counts=self.counts, items=self.items, fingerprint=repr(fingerprint))
+
+    @classmethod
+    def load(cls, path: str = TRENDS_PATH):
+        """Reads a cube written by `save`; returns (cube, fingerprint), or (None, None) if there is none."""
+        if not os.path.exists(path):
+            return None, None
+        with np.load(path) as data:
+            cube = cls()
+            cube.terms = pd.Index(data['terms'].tolist(), dtype=object)
+            cube.term_ids, cube.weeks, cube.counts = data['term_ids'], data['weeks'], data['counts']
+            cube.items = int(data['items'])
+            return cube, str(data['fingerprint'])
+
+
+def load_or_build(df: pd.DataFrame, fingerprint, path: str = TRENDS_PATH) -> TrendCube:
+    """
+    The cube for `df`: read from `path` if it was saved for the same `fingerprint`,
+    otherwise built from scratch and saved.
+    """
+    cube, saved_fingerprint = TrendCube.load(path)
+    if cube is not None and saved_fingerprint == repr(fingerprint):
+        return cube
+    cube = TrendCube().add(df)
+    cube.save(path, fingerprint)
+    return cube
@@ -1,63 +1,160 @@
 # generate_historical_data.py
+import argparse
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
 from faker import Faker
-import random
-
-fake = Faker()
-
-def generate_data(num_records=500):
-    """Generates a realistic, simulated historical dataset of startup news."""
-    data = []
-    start_date = pd.to_datetime("2023-06-01")
-    
-    for _ in range(num_records):
-        company_name = fake.company().replace(',', '')
-        date = start_date + pd.to_timedelta(np.random.randint(0, 730), 'd')
-        source = random.choice(['TechCrunch', 'Product Hunt'])
-        
-        # Increased probability of funding events to make data more interesting
-        event_type = random.choices(['funding', 'launch'], weights=[0.5, 0.5], k=1)[0]
-        
-        outcome = "N/A"
-        roi_potential = 0
-
-        if event_type == 'funding':
-            series = random.choice(['Seed', 'Series A', 'Series B'])
-            amount = random.randint(1, 50)
-            title = f"{company_name} raises ${amount}M in {series} funding"
-            description = f"The company, operating in the {fake.bs()} space, secured funding to expand its team."
-            # Increased probability of a defined outcome
-            if random.random() < 0.6: # 60% chance of a positive outcome
-                outcome = f"Acquired for ${amount * random.randint(5, 20)}M"
-                roi_potential = float(outcome.split('$')[1].split('M')[0]) / amount
-            elif random.random() < 0.2: # 20% chance of failure
-                outcome = "Shut down"
-                roi_potential = -1
-        elif event_type == 'launch':
-            title = f"{company_name} launches new platform for {fake.bs()}"
-            description = f"A new product launch from {company_name} aims to disrupt the market."
-            if random.random() < 0.5: # 50% chance of a good outcome post-launch
-                series = random.choice(['Seed', 'Series A'])
-                outcome = f"Raised {series} funding 12 months post-launch"
-                roi_potential = random.uniform(2, 5)
-        else:
-            title = f"{company_name} announces partnership with {fake.company()}"
-            description = "General tech news update."
-
-        data.append({
-            'date': date.strftime('%Y-%m-%d'),
-            'source': source,
-            'title': title,
-            'description': description,
-            'company_name': company_name,
-            'outcome': outcome,
-            'roi_potential': roi_potential
-        })
-        
-    df = pd.DataFrame(data)
-    df.to_csv('historical_data.csv', index=False)
-    print(f"Generated historical_data.csv with {len(df)} records.")
+
+START_DATE = np.datetime64("2023-06-01")
+DAYS = 730
+COLUMNS = ['date', 'source', 'title', 'description', 'company_name', 'outcome', 'roi_potential']
+
+# Names and phrases are drawn from pools generated once with Faker, so rows can be
+# sampled with NumPy instead of calling Faker per row.
+_pools = None
+
+
+def build_pools(seed: int, num_companies: int = 10_000, num_phrases: int = 5_000) -> dict:
+    """Pre-generates the company name and business-phrase pools rows are sampled from."""
+    fake = Faker()
+    Faker.seed(seed)
+    return {
+        'companies': np.array([fake.company().replace(',', '') for _ in range(num_companies)], dtype=object),
+        'phrases': np.array([fake.bs() for _ in range(num_phrases)], dtype=object),
+    }
+
+
+def _init_worker(pools: dict):
+    global _pools
+    _pools = pools
+
+
+def _join(*parts) -> np.ndarray:
+    """Element-wise string concatenation of arrays and scalars."""
+    result = np.asarray(parts[0], dtype=object)
+    for part in parts[1:]:
+        result = result + np.asarray(part, dtype=object)
+    return result
+
+
+def generate_chunk(num_records: int, seed_sequence) -> pd.DataFrame:
+    """
+    Generates one chunk of the simulated history with vectorized NumPy sampling.
+    Keeps the original distributions: an even split of funding rounds and launches,
+    60% acquisitions / 8% shutdowns after funding and 50% follow-on rounds after launches.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    n = num_records
+
+    company_name = _pools['companies'][rng.integers(0, len(_pools['companies']), n)]
+    phrase = _pools['phrases'][rng.integers(0, len(_pools['phrases']), n)]
+    date = START_DATE + rng.integers(0, DAYS, n).astype('timedelta64[D]')
+    source = np.array(['TechCrunch', 'Product Hunt'], dtype=object)[rng.integers(0, 2, n)]
+    is_funding = rng.random(n) < 0.5
+
+    title = np.empty(n, dtype=object)
+    description = np.empty(n, dtype=object)
+    outcome = np.full(n, "N/A", dtype=object)
+    roi_potential = np.zeros(n)
+
+    # --- Funding rounds ---
+    f = is_funding
+    series = np.array(['Seed', 'Series A', 'Series B'], dtype=object)[rng.integers(0, 3, n)][f]
+    amount = rng.integers(1, 51, n)[f].astype(str).astype(object)
+    multiple = rng.integers(5, 21, n)[f]
+    acquired = (rng.random(n) < 0.6)[f]
+    shut_down = ~acquired & (rng.random(n) < 0.2)[f]
+
+    title[f] = _join(company_name[f], " raises $", amount, "M in ", series, " funding")
+    description[f] = _join("The company, operating in the ", phrase[f], " space, secured funding to expand its team.")
+    exit_value = (amount.astype(int) * multiple).astype(str).astype(object)
+    outcome[f] = np.where(acquired, _join("Acquired for $", exit_value, "M"), np.where(shut_down, "Shut down", "N/A"))
+    roi_potential[f] = np.where(acquired, multiple, np.where(shut_down, -1.0, 0.0))
+
+    # --- Product launches ---
+    launch = ~is_funding
+    launch_series = np.array(['Seed', 'Series A'], dtype=object)[rng.integers(0, 2, n)][launch]
+    raised = (rng.random(n) < 0.5)[launch]
+    launch_roi = rng.uniform(2, 5, n)[launch]
+
+    title[launch] = _join(company_name[launch], " launches new platform for ", phrase[launch])
+    description[launch] = _join("A new product launch from ", company_name[launch], " aims to disrupt the market.")
+    outcome[launch] = np.where(raised, _join("Raised ", launch_series, " funding 12 months post-launch"), "N/A")
+    roi_potential[launch] = np.where(raised, launch_roi, 0.0)
+
+    return pd.DataFrame({
+        'date': np.datetime_as_string(date, unit='D'),
+        'source': source,
+        'title': title,
+        'description': description,
+        'company_name': company_name,
+        'outcome': outcome,
+        'roi_potential': roi_potential,
+    }, columns=COLUMNS)
+
+
+def _write_chunk(df: pd.DataFrame, output: str, as_parquet: bool, writer, written: int):
+    """Appends one chunk to the output file; returns the (possibly new) Parquet writer and row count."""
+    if as_parquet:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(output, table.schema)
+        writer.write_table(table)
+    else:
+        df.to_csv(output, mode='a', header=(written == 0), index=False)
+    return writer, written + len(df)
+
+
+def generate_data(num_records=500, output='historical_data.csv', seed=42, chunk_size=1_000_000, workers=1):
+    """
+    Generates a realistic, simulated historical dataset of startup news.
+
+    Rows are produced in chunks of `chunk_size` (in parallel across `workers`
+    processes) and appended to `output` as they arrive, so memory stays bounded
+    at a few chunks. The output is CSV, or Parquet if `output` ends in '.parquet'.
+    The same seed always yields the same data, whatever the number of workers.
+    """
+    pools = build_pools(seed)
+    chunk_sizes = [min(chunk_size, num_records - start) for start in range(0, num_records, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    as_parquet = output.endswith('.parquet')
+
+    if os.path.exists(output):
+        os.remove(output)
+
+    writer = None
+    written = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(pools,)) as pool:
+        # Keep a bounded window of chunks in flight and write them in order as they finish
+        window = max(1, workers) * 2
+        pending = deque()
+        for size, seed_sequence in zip(chunk_sizes, seeds):
+            pending.append(pool.submit(generate_chunk, size, seed_sequence))
+            if len(pending) >= window:
+                writer, written = _write_chunk(pending.popleft().result(), output, as_parquet, writer, written)
+        while pending:
+            writer, written = _write_chunk(pending.popleft().result(), output, as_parquet, writer, written)
+    if writer is not None:
+        writer.close()
+
+    print(f"Generated {output} with {written} records.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate simulated historical startup news.")
+    parser.add_argument('--rows', type=int, default=500, help="Number of records to generate.")
+    parser.add_argument('--output', default='historical_data.csv', help="Output path (.csv or .parquet).")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed.")
+    parser.add_argument('--chunk-size', type=int, default=1_000_000, help="Rows generated per chunk.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    args = parser.parse_args()
+    generate_data(args.rows, output=args.output, seed=args.seed, chunk_size=args.chunk_size, workers=args.workers)
+
 
 if __name__ == "__main__":
-    generate_data() 
\ No newline at end of file
+    main()
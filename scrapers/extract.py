@@ -0,0 +1,40 @@
+# scrapers/extract.py
+import lxml.html
+from bs4.dammit import EncodingDetector
+
+# Tags whose contents BeautifulSoup's get_text() leaves out
+_NON_TEXT_TAGS = {'script', 'style', 'template'}
+
+
+def parse_document(html: bytes):
+    """
+    Parses a page with lxml's C parser, honouring the charset the page declares.
+    Returns the root element.
+    """
+    encoding = EncodingDetector.find_declared_encoding(html, is_html=True) or 'utf-8'
+    parser = lxml.html.HTMLParser(encoding=encoding)
+    return lxml.html.document_fromstring(html, parser=parser)
+
+
+def class_tokens(element) -> list[str]:
+    """The whitespace-separated values of an element's class attribute."""
+    return element.get('class', '').split()
+
+
+def element_text(element) -> str:
+    """
+    The lxml equivalent of BeautifulSoup's `get_text(strip=True)`: every text
+    node in the subtree, stripped and concatenated, skipping comments and scripts.
+    """
+    return ''.join(part.strip() for part in _strings(element, include_tail=False) if part.strip())
+
+
+def _strings(node, include_tail: bool):
+    # Comments and processing instructions have a non-string tag; only their tail is page text
+    if isinstance(node.tag, str) and node.tag not in _NON_TEXT_TAGS:
+        if node.text:
+            yield node.text
+        for child in node:
+            yield from _strings(child, include_tail=True)
+    if include_tail and node.tail:
+        yield node.tail
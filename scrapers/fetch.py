@@ -0,0 +1,110 @@
+# scrapers/fetch.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) timeouts in seconds for every request
+DEFAULT_TIMEOUT = (3.05, 15)
+
+# Retry transient failures with exponential backoff (0.5s, 1s, 2s, ...)
+RETRY_POLICY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset(["GET"]),
+    raise_on_status=False
+)
+
+_session = None
+_session_lock = threading.Lock()
+
+# Per-URL validators (ETag / Last-Modified) and the frame parsed from the last full response
+_validators = {}
+_validators_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the shared HTTP session. It keeps connections alive and pools them
+    per host, so repeated refreshes skip the TCP/TLS handshake.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=RETRY_POLICY)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def fetch_and_parse(url: str, parse, headers: dict | None = None, timeout=DEFAULT_TIMEOUT) -> pd.DataFrame:
+    """
+    Fetches a page with a conditional GET and parses it.
+
+    If the server answers 304 Not Modified, parsing is skipped entirely and the
+    frame parsed from the previous full response is returned instead.
+
+    Args:
+        url: The page to fetch.
+        parse: A function turning the response body (bytes) into a DataFrame.
+        headers: Extra request headers (e.g., the User-Agent).
+        timeout: Per-request timeout passed to `requests`.
+
+    Raises:
+        requests.RequestException: If the request fails after all retries.
+    """
+    request_headers = dict(headers or {})
+    with _validators_lock:
+        cached = _validators.get(url)
+    if cached:
+        if cached.get("etag"):
+            request_headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            request_headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = get_session().get(url, headers=request_headers, timeout=timeout)
+    if response.status_code == 304 and cached:
+        print(f"{url} not modified, reusing the previous parse.")
+        return cached["parsed"].copy()
+    response.raise_for_status()
+
+    parsed = parse(response.content)
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    with _validators_lock:
+        if etag or last_modified:
+            _validators[url] = {"etag": etag, "last_modified": last_modified, "parsed": parsed.copy()}
+        else:
+            _validators.pop(url, None)
+    return parsed
+
+
+def clear_validators():
+    """Forgets every stored ETag/Last-Modified, forcing full fetches on the next run."""
+    with _validators_lock:
+        _validators.clear()
+
+
+def scrape_all(scrapers) -> list[pd.DataFrame]:
+    """
+    Runs several scraper functions concurrently on a thread pool.
+    The wall-clock time is that of the slowest source rather than the sum of all of them.
+
+    Args:
+        scrapers: Zero-argument callables returning DataFrames (e.g., `techcrunch.scrape`).
+
+    Returns:
+        The scraped DataFrames, in the same order as `scrapers`.
+    """
+    scrapers = list(scrapers)
+    if not scrapers:
+        return []
+    with ThreadPoolExecutor(max_workers=len(scrapers), thread_name_prefix="scraper") as pool:
+        return list(pool.map(lambda scrape: scrape(), scrapers))
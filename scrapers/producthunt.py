@@ -4,7 +4,17 @@ import requests
 from bs4 import BeautifulSoup
 import re
 
-def scrape():
+from core import tracing
+from scrapers import extract, fetch
+
+URL = "https://www.producthunt.com/"
+HEADERS = {
+    'User-Agent': 'ProjectSignalBot/1.0'
+}
+
+
+@tracing.traced('scrape.producthunt', rows_out=len)
+def scrape(url: str = URL):
     """
     Scrapes the Product Hunt homepage for the top daily products.
     
@@ -13,21 +23,20 @@ def scrape():
                       ['source', 'title', 'description']. Returns an empty
                       DataFrame if scraping fails.
     """
-    url = "https://www.producthunt.com/"
-    headers = {
-        'User-Agent': 'ProjectSignalBot/1.0'
-    }
-
     print("Scraping Product Hunt...")
 
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
+        return fetch.fetch_and_parse(url, parse_fast, headers=HEADERS)
     except requests.RequestException as e:
         print(f"Error during request to {url}: {e}")
         return pd.DataFrame()
 
-    soup = BeautifulSoup(response.content, 'html.parser')
+
+def parse(html: bytes) -> pd.DataFrame:
+    """
+    Extracts the top products from the Product Hunt homepage.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
     
     products = []
     
@@ -62,3 +71,41 @@ def scrape():
 
     return pd.DataFrame(products)
 
+
+@tracing.traced('parse.producthunt', rows_out=len)
+def parse_fast(html: bytes) -> pd.DataFrame:
+    """
+    Same output as `parse`, but built on lxml: the page is parsed by the C parser and
+    only the `post-item-*` subtrees are walked, without building a BeautifulSoup tree.
+    """
+    root = extract.parse_document(html)
+    item_pattern = re.compile(r'post-item-\d+')
+    name_pattern = re.compile(r'post-name-\d+')
+    product_elements = [
+        section for section in root.iter('section')
+        if item_pattern.search(section.get('data-test', ''))
+    ]
+
+    if not product_elements:
+        print("No product elements found. The page structure may have changed.")
+        return pd.DataFrame()
+
+    products = []
+    for product in product_elements:
+        title_element = next(
+            (a for a in product.iter('a') if name_pattern.search(a.get('data-test', ''))), None
+        )
+        if title_element is None:
+            continue
+
+        # The description is the next 'a' sibling of the title link
+        description_element = next(title_element.itersiblings('a'), None)
+        if description_element is not None:
+            title = re.sub(r'^\d+\.\s*', '', extract.element_text(title_element))
+            products.append({
+                'source': 'Product Hunt',
+                'title': title,
+                'description': extract.element_text(description_element)
+            })
+
+    return pd.DataFrame(products)
@@ -3,7 +3,17 @@ import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 
-def scrape():
+from core import tracing
+from scrapers import extract, fetch
+
+URL = "https://techcrunch.com/category/startups/"
+HEADERS = {
+    'User-Agent': 'ProjectSignalBot/1.0'
+}
+
+
+@tracing.traced('scrape.techcrunch', rows_out=len)
+def scrape(url: str = URL):
     """
     Scrapes the TechCrunch "Startups" category page for the latest articles.
     
@@ -12,21 +22,20 @@ def scrape():
                       ['source', 'title', 'description']. Returns an empty
                       DataFrame if scraping fails.
     """
-    url = "https://techcrunch.com/category/startups/"
-    headers = {
-        'User-Agent': 'ProjectSignalBot/1.0'
-    }
-    
     print("Scraping TechCrunch Startups...")
 
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()  # Raise an exception for bad status codes
+        return fetch.fetch_and_parse(url, parse_fast, headers=HEADERS)
     except requests.RequestException as e:
         print(f"Error during request to {url}: {e}")
         return pd.DataFrame()
 
-    soup = BeautifulSoup(response.content, 'html.parser')
+
+def parse(html: bytes) -> pd.DataFrame:
+    """
+    Extracts the articles from a TechCrunch category page.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
     
     articles = []
     
@@ -58,3 +67,35 @@ def scrape():
             continue # Move to the next article
 
     return pd.DataFrame(articles)
+
+
+@tracing.traced('parse.techcrunch', rows_out=len)
+def parse_fast(html: bytes) -> pd.DataFrame:
+    """
+    Same output as `parse`, but built on lxml: the page is parsed by the C parser and
+    only the `wp-block-post` subtrees are walked, without building a BeautifulSoup tree.
+    """
+    root = extract.parse_document(html)
+    article_elements = [
+        li for li in root.iter('li')
+        if any(token.startswith('wp-block-post') for token in extract.class_tokens(li))
+    ]
+
+    if not article_elements:
+        print("No article elements found. The page structure may have changed.")
+        return pd.DataFrame()
+
+    articles = []
+    for article in article_elements:
+        title_element = next(
+            (h3 for h3 in article.iter('h3') if 'loop-card__title' in extract.class_tokens(h3)), None
+        )
+        if title_element is not None and next(title_element.iter('a'), None) is not None:
+            title = extract.element_text(title_element)
+            articles.append({
+                'source': 'TechCrunch',
+                'title': title,
+                'description': title
+            })
+
+    return pd.DataFrame(articles)
@@ -0,0 +1,111 @@
+# tests/test_ai_analyst.py
+import asyncio
+import threading
+import time
+import types
+
+import pytest
+
+from core import ai_analyst
+from core.cache import SQLiteCache
+
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    """A stub backend with a fresh cache and a rate limiter that never waits."""
+    stub = ai_analyst.StubBackend(delay=0.05)
+    monkeypatch.setattr(ai_analyst, '_backend', stub)
+    monkeypatch.setattr(ai_analyst, '_cache', SQLiteCache(str(tmp_path / 'analyst.sqlite')))
+    monkeypatch.setattr(ai_analyst, '_rate_limiter', ai_analyst.TokenBucket(rate=1000, capacity=1000))
+    return stub
+
+
+def test_answers_are_cached(backend):
+    first = asyncio.run(ai_analyst.get_analyst_take('Acme raises $5M', 'Seed round'))
+    second = asyncio.run(ai_analyst.get_analyst_take('Acme raises $5M', 'Seed round'))
+    assert first == second == backend.response
+    assert backend.calls == 1
+
+
+def test_cache_is_keyed_by_model(backend):
+    asyncio.run(ai_analyst.get_analyst_take('Acme raises $5M', 'Seed round'))
+    backend.model_name = 'stub-2'
+    asyncio.run(ai_analyst.get_analyst_take('Acme raises $5M', 'Seed round'))
+    assert backend.calls == 2
+
+
+def test_concurrent_identical_requests_share_one_call(backend):
+    results = asyncio.run(ai_analyst.prefetch([('Acme', 'Seed round')] * 5 + [('Beta', 'Series A')]))
+    assert results == [backend.response] * 6
+    assert backend.calls == 2
+
+
+def test_requests_from_other_event_loops_share_one_call(backend):
+    results = []
+
+    def request():
+        results.append(asyncio.run(ai_analyst.get_analyst_take('Acme', 'Seed round')))
+
+    threads = [threading.Thread(target=request) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [backend.response] * 4
+    assert backend.calls == 1
+
+
+def test_failures_are_reported_and_not_cached(backend):
+    async def fail(prompt):
+        raise RuntimeError('quota exceeded')
+
+    errors = []
+    backend.generate = fail
+    assert asyncio.run(ai_analyst.get_analyst_take('Acme', 'Seed round', on_error=errors.append)) == ai_analyst.ERROR_MESSAGE
+    assert [str(e) for e in errors] == ['quota exceeded']
+
+    del backend.generate
+    assert asyncio.run(ai_analyst.get_analyst_take('Acme', 'Seed round')) == backend.response
+
+
+def test_token_bucket_allows_a_burst_then_paces_calls():
+    bucket = ai_analyst.TokenBucket(rate=10, capacity=2)
+    waits = [bucket._reserve() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(0.1, abs=0.02)
+    assert waits[3] == pytest.approx(0.2, abs=0.02)
+
+
+def test_backend_calls_are_rate_limited(backend, monkeypatch):
+    backend.delay = 0
+    monkeypatch.setattr(ai_analyst, '_rate_limiter', ai_analyst.TokenBucket(rate=20, capacity=1))
+    started = time.perf_counter()
+    asyncio.run(ai_analyst.prefetch([(f'Company {i}', 'Seed round') for i in range(3)]))
+    assert time.perf_counter() - started >= 0.09
+    assert backend.calls == 3
+
+
+class _LoopBoundModel:
+    """Mimics the SDK's async client, which only works on the event loop it was first used on."""
+
+    def __init__(self):
+        self.loop = None
+
+    async def generate_content_async(self, prompt):
+        loop = asyncio.get_running_loop()
+        self.loop = self.loop or loop
+        assert self.loop is loop, 'client used from another event loop'
+        return types.SimpleNamespace(text='analysis')
+
+
+def test_gemini_backend_runs_every_call_on_one_loop():
+    gemini = ai_analyst.GeminiBackend(api_key='unused')
+    gemini._model = _LoopBoundModel()
+
+    results = [asyncio.run(gemini.generate('a')), asyncio.run(gemini.generate('b'))]
+    thread = threading.Thread(target=lambda: results.append(asyncio.run(gemini.generate('c'))))
+    thread.start()
+    thread.join()
+
+    assert results == ['analysis'] * 3
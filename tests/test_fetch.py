@@ -0,0 +1,127 @@
+# tests/test_fetch.py
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from benchmarks.bench_parsers import load_fixture
+from scrapers import fetch, techcrunch
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves `server.pages` (path -> (body, etag or None)), answering 304 to a matching If-None-Match."""
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path not in self.server.pages:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body, etag = self.server.pages[self.path]
+        if etag is not None and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        if etag is not None:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    httpd.pages, httpd.requests = {}, []
+    httpd.url = f'http://127.0.0.1:{httpd.server_port}'
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    fetch.clear_validators()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+    fetch.clear_validators()
+
+
+def _counting(parse):
+    """Wraps a parse function, counting its calls in `.calls`."""
+    def wrapped(html):
+        wrapped.calls += 1
+        return parse(html)
+    wrapped.calls = 0
+    return wrapped
+
+
+def test_not_modified_reuses_previous_parse(server):
+    server.pages['/startups'] = (load_fixture('techcrunch_startups.html'), '"v1"')
+    parse = _counting(techcrunch.parse_fast)
+
+    first = fetch.fetch_and_parse(server.url + '/startups', parse)
+    second = fetch.fetch_and_parse(server.url + '/startups', parse)
+
+    assert len(first) > 0
+    assert parse.calls == 1
+    pd.testing.assert_frame_equal(first, second)
+    # The cached frame is handed out as a copy
+    second.loc[0, 'title'] = 'changed'
+    pd.testing.assert_frame_equal(fetch.fetch_and_parse(server.url + '/startups', parse), first)
+
+
+def test_changed_etag_is_parsed_again(server):
+    server.pages['/startups'] = (load_fixture('techcrunch_startups.html'), '"v1"')
+    parse = _counting(techcrunch.parse_fast)
+    fetch.fetch_and_parse(server.url + '/startups', parse)
+
+    server.pages['/startups'] = (load_fixture('techcrunch_startups.html'), '"v2"')
+    fetch.fetch_and_parse(server.url + '/startups', parse)
+    assert parse.calls == 2
+
+
+def test_responses_without_validators_are_always_parsed(server):
+    server.pages['/startups'] = (load_fixture('techcrunch_startups.html'), None)
+    parse = _counting(techcrunch.parse_fast)
+    fetch.fetch_and_parse(server.url + '/startups', parse)
+    fetch.fetch_and_parse(server.url + '/startups', parse)
+    assert parse.calls == 2
+
+
+def test_clear_validators_forces_a_full_fetch(server):
+    server.pages['/startups'] = (load_fixture('techcrunch_startups.html'), '"v1"')
+    parse = _counting(techcrunch.parse_fast)
+    fetch.fetch_and_parse(server.url + '/startups', parse)
+    fetch.clear_validators()
+    fetch.fetch_and_parse(server.url + '/startups', parse)
+    assert parse.calls == 2
+
+
+def test_scrape_reads_the_given_url(server):
+    html = load_fixture('techcrunch_startups.html')
+    server.pages['/startups'] = (html, '"v1"')
+
+    df = techcrunch.scrape(url=server.url + '/startups')
+
+    pd.testing.assert_frame_equal(df, techcrunch.parse(html))
+    assert server.requests == ['/startups']
+
+
+def test_scrape_returns_an_empty_frame_on_http_errors(server):
+    assert techcrunch.scrape(url=server.url + '/missing').empty
+
+
+def test_scrape_all_keeps_the_scrapers_order(server):
+    started = threading.Barrier(3)
+
+    def scraper(name):
+        def scrape():
+            started.wait(timeout=5)  # All three run at once
+            return pd.DataFrame({'source': [name]})
+        return scrape
+
+    frames = fetch.scrape_all([scraper('a'), scraper('b'), scraper('c')])
+    assert [df['source'][0] for df in frames] == ['a', 'b', 'c']
+    assert fetch.scrape_all([]) == []
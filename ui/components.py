@@ -10,13 +10,32 @@ def render_footer():
     st.markdown("---")
     st.markdown("Built by Lakshyaraj Bhati as a case study in automated VC tooling.")
 
-def render_analysis_section(trends_df):
-    """Renders the trend analysis chart and interpretation."""
+def render_analysis_section(momentum_df, bursts_df, window=4):
+    """Renders the keyword momentum chart, the week's breakout terms and an interpretation."""
     st.header("Automated Market Trend Analysis")
-    st.subheader("Keyword Frequency in Recent News & Launches")
-    st.bar_chart(trends_df.set_index('Keyword'))
+    st.subheader(f"Keyword Momentum (mentions over the trailing {window} weeks)")
+    if momentum_df.empty:
+        st.info("No dated items to chart yet.")
+    else:
+        st.line_chart(momentum_df)
+    st.subheader("Breakout Terms This Week")
+    if bursts_df.empty:
+        st.caption("No term was mentioned often enough this week to call a breakout.")
+    else:
+        st.dataframe(bursts_df, use_container_width=True, hide_index=True)
     st.markdown("""
-    **How to interpret this:** This chart provides a quick snapshot of which technology sectors 
-    are currently generating the most buzz. A VC analyst can use this to quickly identify hot 
-    sectors and dig deeper into the corresponding articles and products.
+    **How to interpret this:** The chart shows whether each technology sector is gaining or losing
+    buzz over time, and the breakout table lists the terms whose mentions jumped the most versus
+    the week before. A VC analyst can use this to spot sectors heating up early and dig deeper
+    into the corresponding articles and products.
     """)
+
+def render_performance_panel(summary_df, jsonl_export, prometheus_export):
+    """Renders the collapsible per-stage performance panel in the sidebar."""
+    with st.sidebar.expander("⏱️ Performance"):
+        if summary_df.empty:
+            st.caption("No stages have run yet.")
+            return
+        st.dataframe(summary_df, use_container_width=True)
+        st.download_button("Export spans (JSON lines)", jsonl_export, file_name="signal_spans.jsonl")
+        st.download_button("Export metrics (Prometheus)", prometheus_export, file_name="signal_metrics.prom")